@@ -22,8 +22,8 @@ Usage:
   # Update page type
   python scripts/qa/apply_operator_corrections.py --page-ids 5 6 7 --page-type plate
 
-  # Mark pages as spread
-  python scripts/qa/apply_operator_corrections.py --spread 10 11 12
+  # Mark pages as spread (pairs: 10<->11, 12<->13)
+  python scripts/qa/apply_operator_corrections.py --spread 10 11 12 13
 
   # Interactive mode
   python scripts/qa/apply_operator_corrections.py --interactive
@@ -35,9 +35,10 @@ import argparse
 import json
 import logging
 import sys
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 from scripts.common import hjb_db
@@ -59,11 +60,26 @@ logger = logging.getLogger(__name__)
 # Correction Functions
 # =============================================================================
 
+def _cursor_scope(db_conn: Any, cursor: Any = None, **cursor_kwargs: Any):
+    """
+    Context manager for a helper's cursor.
+
+    Yields the caller's cursor unchanged (it stays open for reuse), or opens a
+    new cursor with cursor_kwargs that is closed when the block exits,
+    including on error paths.
+    """
+    if cursor is not None:
+        return nullcontext(cursor)
+    return db_conn.cursor(**cursor_kwargs)
+
+
 def mark_pages_verified(
     db_conn: Any,
     container_id: int,
     page_ids: Optional[List[int]] = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    *,
+    cursor: Any = None
 ) -> Dict[str, Any]:
     """
     Mark pages as manually verified.
@@ -73,6 +89,7 @@ def mark_pages_verified(
         container_id: Container ID (required)
         page_ids: Specific page IDs (if None, all in container)
         dry_run: If True, don't execute
+        cursor: Existing cursor to reuse (one is opened and closed if None)
 
     Returns:
         Result dictionary
@@ -85,41 +102,39 @@ def mark_pages_verified(
     }
 
     try:
-        cursor = db_conn.cursor()
-
-        if page_ids:
-            # Mark specific pages
-            placeholders = ','.join(['%s'] * len(page_ids))
-            query = f"""
-                UPDATE pages_t
-                SET is_manually_verified = 1, updated_at = NOW()
-                WHERE page_id IN ({placeholders})
-                AND container_id = %s
-            """
-            params = page_ids + [container_id]
-            logger.info(f"Marking {len(page_ids)} specific pages as verified")
-        else:
-            # Mark all pages in container
-            query = """
-                UPDATE pages_t
-                SET is_manually_verified = 1, updated_at = NOW()
-                WHERE container_id = %s
-            """
-            params = [container_id]
-            logger.info(f"Marking all pages in container {container_id} as verified")
-
-        if dry_run:
-            logger.info("[DRY RUN] Would execute:")
-            logger.info(f"  {query % tuple(params)}")
-            result['rows_affected'] = 0
-        else:
-            cursor.execute(query, params)
-            db_conn.commit()
-            result['rows_affected'] = cursor.rowcount
-            logger.info(f"Marked {cursor.rowcount} pages as verified")
+        with _cursor_scope(db_conn, cursor) as cursor:
+            if page_ids:
+                # Mark specific pages
+                placeholders = ','.join(['%s'] * len(page_ids))
+                query = f"""
+                    UPDATE pages_t
+                    SET is_manually_verified = 1, updated_at = NOW()
+                    WHERE page_id IN ({placeholders})
+                    AND container_id = %s
+                """
+                params = page_ids + [container_id]
+                logger.info(f"Marking {len(page_ids)} specific pages as verified")
+            else:
+                # Mark all pages in container
+                query = """
+                    UPDATE pages_t
+                    SET is_manually_verified = 1, updated_at = NOW()
+                    WHERE container_id = %s
+                """
+                params = [container_id]
+                logger.info(f"Marking all pages in container {container_id} as verified")
+
+            if dry_run:
+                logger.info("[DRY RUN] Would execute:")
+                logger.info(f"  {query % tuple(params)}")
+                result['rows_affected'] = 0
+            else:
+                cursor.execute(query, params)
+                db_conn.commit()
+                result['rows_affected'] = cursor.rowcount
+                logger.info(f"Marked {cursor.rowcount} pages as verified")
 
-        cursor.close()
-        return result
+            return result
 
     except mysql.connector.Error as e:
         result['error'] = f"Database error: {e}"
@@ -132,7 +147,9 @@ def update_page_types(
     db_conn: Any,
     page_ids: List[int],
     new_type: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    *,
+    cursor: Any = None
 ) -> Dict[str, Any]:
     """
     Update page_type for given pages.
@@ -142,6 +159,7 @@ def update_page_types(
         page_ids: List of page IDs
         new_type: New page type (enum: content, cover, index, toc, advertisement, plate, blank, other)
         dry_run: If True, don't execute
+        cursor: Existing cursor to reuse (one is opened and closed if None)
 
     Returns:
         Result dictionary
@@ -162,30 +180,28 @@ def update_page_types(
         return result
 
     try:
-        cursor = db_conn.cursor()
-
-        placeholders = ','.join(['%s'] * len(page_ids))
-        query = f"""
-            UPDATE pages_t
-            SET page_type = %s, updated_at = NOW()
-            WHERE page_id IN ({placeholders})
-        """
-        params = [new_type] + page_ids
-
-        logger.info(f"Updating {len(page_ids)} pages to type '{new_type}'")
-
-        if dry_run:
-            logger.info("[DRY RUN] Would execute:")
-            logger.info(f"  UPDATE pages_t SET page_type = '{new_type}' WHERE page_id IN ({placeholders})")
-            result['rows_affected'] = len(page_ids)
-        else:
-            cursor.execute(query, params)
-            db_conn.commit()
-            result['rows_affected'] = cursor.rowcount
-            logger.info(f"Updated {cursor.rowcount} pages")
+        with _cursor_scope(db_conn, cursor) as cursor:
+            placeholders = ','.join(['%s'] * len(page_ids))
+            query = f"""
+                UPDATE pages_t
+                SET page_type = %s, updated_at = NOW()
+                WHERE page_id IN ({placeholders})
+            """
+            params = [new_type] + page_ids
 
-        cursor.close()
-        return result
+            logger.info(f"Updating {len(page_ids)} pages to type '{new_type}'")
+
+            if dry_run:
+                logger.info("[DRY RUN] Would execute:")
+                logger.info(f"  UPDATE pages_t SET page_type = '{new_type}' WHERE page_id IN ({placeholders})")
+                result['rows_affected'] = len(page_ids)
+            else:
+                cursor.execute(query, params)
+                db_conn.commit()
+                result['rows_affected'] = cursor.rowcount
+                logger.info(f"Updated {cursor.rowcount} pages")
+
+            return result
 
     except mysql.connector.Error as e:
         result['error'] = f"Database error: {e}"
@@ -198,7 +214,9 @@ def mark_spread(
     db_conn: Any,
     page_id_1: int,
     page_id_2: int,
-    dry_run: bool = False
+    dry_run: bool = False,
+    *,
+    cursor: Any = None
 ) -> Dict[str, Any]:
     """
     Mark two pages as a spread (2-page image).
@@ -208,6 +226,7 @@ def mark_spread(
         page_id_1: First page ID
         page_id_2: Second page ID
         dry_run: If True, don't execute
+        cursor: Existing cursor to reuse (one is opened and closed if None)
 
     Returns:
         Result dictionary
@@ -221,36 +240,112 @@ def mark_spread(
     }
 
     try:
-        cursor = db_conn.cursor()
+        with _cursor_scope(db_conn, cursor) as cursor:
+            # Mark both pages as spreads and link them
+            query1 = """
+                UPDATE pages_t
+                SET is_spread = 1, is_spread_with = %s, updated_at = NOW()
+                WHERE page_id = %s
+            """
 
-        # Mark both pages as spreads and link them
-        query1 = """
-            UPDATE pages_t
-            SET is_spread = 1, is_spread_with = %s, updated_at = NOW()
-            WHERE page_id = %s
-        """
+            logger.info(f"Marking pages {page_id_1} and {page_id_2} as spread")
 
-        logger.info(f"Marking pages {page_id_1} and {page_id_2} as spread")
+            if dry_run:
+                logger.info("[DRY RUN] Would mark pages as spread:")
+                logger.info(f"  Page {page_id_1} <-> Page {page_id_2}")
+                result['rows_affected'] = 2
+            else:
+                # Update page 1
+                cursor.execute(query1, (page_id_2, page_id_1))
+                db_conn.commit()
 
-        if dry_run:
-            logger.info("[DRY RUN] Would mark pages as spread:")
-            logger.info(f"  Page {page_id_1} <-> Page {page_id_2}")
-            result['rows_affected'] = 2
-        else:
-            # Update page 1
-            cursor.execute(query1, (page_id_2, page_id_1))
-            db_conn.commit()
+                # Update page 2
+                cursor.execute(query1, (page_id_1, page_id_2))
+                db_conn.commit()
 
-            # Update page 2
-            cursor.execute(query1, (page_id_1, page_id_2))
-            db_conn.commit()
+                result['rows_affected'] = 2
+                logger.info(f"Marked spread: {page_id_1} <-> {page_id_2}")
 
-            result['rows_affected'] = 2
-            logger.info(f"Marked spread: {page_id_1} <-> {page_id_2}")
+            return result
 
-        cursor.close()
+    except mysql.connector.Error as e:
+        result['error'] = f"Database error: {e}"
+        logger.error(result['error'])
+        db_conn.rollback()
         return result
 
+
+def mark_spreads_bulk(
+    db_conn: Any,
+    pairs: List[Tuple[int, int]],
+    dry_run: bool = False,
+    *,
+    cursor: Any = None
+) -> Dict[str, Any]:
+    """
+    Mark several page pairs as spreads in one UPDATE and one commit.
+
+    Args:
+        db_conn: Database connection
+        pairs: List of (page_id_1, page_id_2) tuples
+        dry_run: If True, don't execute
+        cursor: Existing cursor to reuse (one is opened and closed if None)
+
+    Returns:
+        Result dictionary
+    """
+    result = {
+        'operation': 'mark_spreads_bulk',
+        'pairs': pairs,
+        'rows_affected': 0,
+        'error': None,
+    }
+
+    if not pairs:
+        return result
+
+    # Each page links to its partner. A page in more than one pair keeps its
+    # partner from the last one, as marking the pairs one at a time would
+    # (CASE would take the first matching WHEN)
+    partners: Dict[int, int] = {}
+    for page_id_1, page_id_2 in pairs:
+        partners[page_id_1] = page_id_2
+        partners[page_id_2] = page_id_1
+
+    # CASE page_id WHEN p1 THEN p2 WHEN p2 THEN p1 ...
+    case_params: List[int] = []
+    for page_id, partner_id in partners.items():
+        case_params += [page_id, partner_id]
+    page_ids = list(partners)
+
+    case_sql = ' '.join(['WHEN %s THEN %s'] * len(partners))
+    placeholders = ','.join(['%s'] * len(page_ids))
+    query = f"""
+        UPDATE pages_t
+        SET is_spread = 1,
+            is_spread_with = CASE page_id {case_sql} END,
+            updated_at = NOW()
+        WHERE page_id IN ({placeholders})
+    """
+    params = case_params + page_ids
+
+    logger.info(f"Marking {len(pairs)} page pairs as spreads")
+
+    if dry_run:
+        logger.info("[DRY RUN] Would mark pages as spread:")
+        for page_id_1, page_id_2 in pairs:
+            logger.info(f"  Page {page_id_1} <-> Page {page_id_2}")
+        result['rows_affected'] = len(page_ids)
+        return result
+
+    try:
+        with _cursor_scope(db_conn, cursor) as cursor:
+            cursor.execute(query, params)
+            db_conn.commit()
+            result['rows_affected'] = cursor.rowcount
+            logger.info(f"Marked {len(pairs)} spreads ({cursor.rowcount} pages updated)")
+            return result
+
     except mysql.connector.Error as e:
         result['error'] = f"Database error: {e}"
         logger.error(result['error'])
@@ -261,7 +356,9 @@ def mark_spread(
 def unmark_spread(
     db_conn: Any,
     page_id: int,
-    dry_run: bool = False
+    dry_run: bool = False,
+    *,
+    cursor: Any = None
 ) -> Dict[str, Any]:
     """
     Unmark a page from spread.
@@ -270,6 +367,7 @@ def unmark_spread(
         db_conn: Database connection
         page_id: Page ID
         dry_run: If True, don't execute
+        cursor: Existing cursor to reuse (one is opened and closed if None)
 
     Returns:
         Result dictionary
@@ -282,46 +380,43 @@ def unmark_spread(
     }
 
     try:
-        cursor = db_conn.cursor()
-
-        # First, find linked page
-        query_get = "SELECT is_spread_with FROM pages_t WHERE page_id = %s"
-        cursor.execute(query_get, (page_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            result['error'] = f"Page {page_id} not found"
-            logger.error(result['error'])
-            cursor.close()
-            return result
+        with _cursor_scope(db_conn, cursor) as cursor:
+            # First, find linked page
+            query_get = "SELECT is_spread_with FROM pages_t WHERE page_id = %s"
+            cursor.execute(query_get, (page_id,))
+            row = cursor.fetchone()
 
-        linked_page_id = row[0] if row else None
+            if not row:
+                result['error'] = f"Page {page_id} not found"
+                logger.error(result['error'])
+                return result
 
-        query = """
-            UPDATE pages_t
-            SET is_spread = 0, is_spread_with = NULL, updated_at = NOW()
-            WHERE page_id = %s
-        """
+            linked_page_id = row[0] if row else None
 
-        logger.info(f"Unmarking page {page_id} from spread")
+            query = """
+                UPDATE pages_t
+                SET is_spread = 0, is_spread_with = NULL, updated_at = NOW()
+                WHERE page_id = %s
+            """
 
-        if dry_run:
-            logger.info(f"[DRY RUN] Would unmark page {page_id} from spread")
-            result['rows_affected'] = 1
-        else:
-            # Unmark both pages
-            cursor.execute(query, (page_id,))
-            db_conn.commit()
+            logger.info(f"Unmarking page {page_id} from spread")
 
-            if linked_page_id:
-                cursor.execute(query, (linked_page_id,))
+            if dry_run:
+                logger.info(f"[DRY RUN] Would unmark page {page_id} from spread")
+                result['rows_affected'] = 1
+            else:
+                # Unmark both pages
+                cursor.execute(query, (page_id,))
                 db_conn.commit()
 
-            result['rows_affected'] = 1
-            logger.info(f"Unmarked page {page_id}")
+                if linked_page_id:
+                    cursor.execute(query, (linked_page_id,))
+                    db_conn.commit()
 
-        cursor.close()
-        return result
+                result['rows_affected'] = 1
+                logger.info(f"Unmarked page {page_id}")
+
+            return result
 
     except mysql.connector.Error as e:
         result['error'] = f"Database error: {e}"
@@ -332,30 +427,34 @@ def unmark_spread(
 
 def show_page_info(
     db_conn: Any,
-    page_id: int
+    page_id: int,
+    *,
+    cursor: Any = None
 ) -> Dict[str, Any]:
-    """Display current information about a page."""
+    """Display current information about a page.
+
+    An existing dictionary cursor may be passed in to avoid allocating one.
+    """
     try:
-        cursor = db_conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT page_id, container_id, page_index, page_type,
-                   is_cover, is_blank, is_spread, is_spread_with,
-                   ocr_confidence, is_manually_verified
-            FROM pages_t
-            WHERE page_id = %s
-        """, (page_id,))
-
-        row = cursor.fetchone()
-        cursor.close()
-
-        if row:
-            logger.info(f"Page {page_id} Info:")
-            for key, value in row.items():
-                logger.info(f"  {key}: {value}")
-            return row
-        else:
-            logger.warning(f"Page {page_id} not found")
-            return None
+        with _cursor_scope(db_conn, cursor, dictionary=True) as cursor:
+            cursor.execute("""
+                SELECT page_id, container_id, page_index, page_type,
+                       is_cover, is_blank, is_spread, is_spread_with,
+                       ocr_confidence, is_manually_verified
+                FROM pages_t
+                WHERE page_id = %s
+            """, (page_id,))
+
+            row = cursor.fetchone()
+
+            if row:
+                logger.info(f"Page {page_id} Info:")
+                for key, value in row.items():
+                    logger.info(f"  {key}: {value}")
+                return row
+            else:
+                logger.warning(f"Page {page_id} not found")
+                return None
 
     except Exception as e:
         logger.error(f"Failed to query page: {e}")
@@ -372,6 +471,13 @@ def interactive_mode(db_conn: Any):
     logger.info("HJB Operator Corrections - Interactive Mode")
     logger.info("=" * 70)
 
+    # One cursor for the whole session; show_page_info needs a dictionary cursor
+    with db_conn.cursor() as cursor, db_conn.cursor(dictionary=True) as dict_cursor:
+        _interactive_loop(db_conn, cursor, dict_cursor)
+
+
+def _interactive_loop(db_conn: Any, cursor: Any, dict_cursor: Any):
+    """Menu loop for interactive_mode, reusing the session's cursors."""
     while True:
         logger.info("""
 Options:
@@ -390,30 +496,30 @@ Options:
                 container_id = int(input("Container ID: "))
                 confirm = input(f"Mark ALL pages in container {container_id} as verified? (yes/no): ")
                 if confirm.lower() == 'yes':
-                    result = mark_pages_verified(db_conn, container_id)
+                    result = mark_pages_verified(db_conn, container_id, cursor=cursor)
                     logger.info(f"Result: {result}")
 
             elif choice == '2':
                 page_ids_str = input("Page IDs (comma-separated): ")
                 page_ids = [int(x.strip()) for x in page_ids_str.split(',')]
                 page_type = input("New type (content/cover/index/toc/advertisement/plate/blank/other): ")
-                result = update_page_types(db_conn, page_ids, page_type)
+                result = update_page_types(db_conn, page_ids, page_type, cursor=cursor)
                 logger.info(f"Result: {result}")
 
             elif choice == '3':
                 page_id_1 = int(input("First page ID: "))
                 page_id_2 = int(input("Second page ID: "))
-                result = mark_spread(db_conn, page_id_1, page_id_2)
+                result = mark_spread(db_conn, page_id_1, page_id_2, cursor=cursor)
                 logger.info(f"Result: {result}")
 
             elif choice == '4':
                 page_id = int(input("Page ID: "))
-                result = unmark_spread(db_conn, page_id)
+                result = unmark_spread(db_conn, page_id, cursor=cursor)
                 logger.info(f"Result: {result}")
 
             elif choice == '5':
                 page_id = int(input("Page ID: "))
-                show_page_info(db_conn, page_id)
+                show_page_info(db_conn, page_id, cursor=dict_cursor)
 
             elif choice == '6':
                 logger.info("Exiting")
@@ -476,10 +582,10 @@ def main():
 
             # Mark spread
             if args.spread and len(args.spread) >= 2:
-                for i in range(0, len(args.spread) - 1, 2):
-                    result = mark_spread(db_conn, args.spread[i], args.spread[i + 1], dry_run=args.dry_run)
-                    logger.info(f"Result: {result}")
-                return 0
+                pairs = list(zip(args.spread[0::2], args.spread[1::2]))
+                result = mark_spreads_bulk(db_conn, pairs, dry_run=args.dry_run)
+                logger.info(f"Result: {result}")
+                return 0 if not result['error'] else 1
 
             # Unmark spread
             if args.unspread:
@@ -16,6 +16,8 @@ Output:
 
 Usage:
   python scripts/qa/generate_qc_report.py --container-id 1
+  python scripts/qa/generate_qc_report.py --container-id 1 2 3
+  python scripts/qa/generate_qc_report.py --container-id 1 2 3 --use-db
   python scripts/qa/generate_qc_report.py --manifest-path 0220_Page_Packs/1/manifest.json
   python scripts/qa/generate_qc_report.py --segmentation-path 0220_Page_Packs/1/segmentation/segmentation_v2_1.json
 """
@@ -23,13 +25,17 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
 import json
 import logging
+import mmap
+import os
 import sys
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -42,15 +48,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Optional fast JSON parser (falls back to stdlib json)
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# JSON files larger than this are parsed straight from a memory map (orjson only)
+MMAP_THRESHOLD_BYTES = 1 << 20
+
 
 # =============================================================================
 # HTML Report Generation
 # =============================================================================
 
+def _html_row(
+    work_number: Any,
+    work_type: str,
+    pages_str: str,
+    title: str,
+    confidence_pct: int,
+    image_count: Any,
+    headline: str
+) -> str:
+    """Render one <tr> of the Detected Works table (single f-string, no .format)."""
+    return f"""
+                <tr>
+                    <td>{work_number}</td>
+                    <td><span class="type-{work_type}">{work_type.upper()}</span></td>
+                    <td>{pages_str}</td>
+                    <td>{title}</td>
+                    <td><span class="confidence">{confidence_pct}%</span></td>
+                    <td>{image_count}</td>
+                    <td>{headline}</td>
+                </tr>
+"""
+
+
 def generate_html_report(
     container_id: int,
     manifest_data: Dict[str, Any],
-    segmentation_data: Optional[Dict[str, Any]] = None
+    segmentation_data: Optional[Dict[str, Any]] = None,
+    type_counts: Optional[Dict[str, int]] = None
 ) -> str:
     """
     Generate HTML QC report with work summaries.
@@ -59,6 +98,8 @@ def generate_html_report(
         container_id: Container ID
         manifest_data: Page pack manifest dictionary
         segmentation_data: Optional segmentation manifest
+        type_counts: Optional precomputed work-type counts (e.g. from
+            get_work_type_counts); counted from segmentation_data if None
 
     Returns:
         HTML string
@@ -67,10 +108,11 @@ def generate_html_report(
     works = segmentation_data.get('works', []) if segmentation_data else []
 
     # Type counts
-    type_counts = {}
-    for work in works:
-        work_type = work.get('type', 'unknown')
-        type_counts[work_type] = type_counts.get(work_type, 0) + 1
+    if type_counts is None:
+        type_counts = {}
+        for work in works:
+            work_type = work.get('type', 'unknown')
+            type_counts[work_type] = type_counts.get(work_type, 0) + 1
 
     # Average confidence
     avg_confidence = (
@@ -260,29 +302,19 @@ def generate_html_report(
             <tbody>
 """
 
+    rows = []
     for work in works:
-        work_number = work['work_number']
-        work_type = work['type']
-        pages_str = ', '.join(str(p) for p in work['pages'])
-        title = work.get('title', '(No title)')[:60]
-        confidence = work['confidence']
-        image_count = work.get('image_count', 0)
         headline = 'Headline detected' if work.get('metadata', {}).get('headline_detected') else ''
-
-        type_class = f'type-{work_type}'
-        confidence_pct = int(confidence * 100)
-
-        html += f"""
-                <tr>
-                    <td>{work_number}</td>
-                    <td><span class="{type_class}">{work_type.upper()}</span></td>
-                    <td>{pages_str}</td>
-                    <td>{title}</td>
-                    <td><span class="confidence">{confidence_pct}%</span></td>
-                    <td>{image_count}</td>
-                    <td>{headline}</td>
-                </tr>
-"""
+        rows.append(_html_row(
+            work['work_number'],
+            work['type'],
+            ', '.join(map(str, work['pages'])),
+            work.get('title', '(No title)')[:60],
+            int(work['confidence'] * 100),
+            work.get('image_count', 0),
+            headline,
+        ))
+    html += ''.join(rows)
 
     html += """
             </tbody>
@@ -327,7 +359,7 @@ def generate_csv_report(works: List[Dict[str, Any]]) -> List[List[str]]:
     for work in works:
         work_number = work['work_number']
         work_type = work['type']
-        pages_str = ','.join(str(p) for p in work.get('pages', []))
+        pages_str = ','.join(map(str, work.get('pages', ())))
         title = work.get('title', '')[:100]
         confidence = f"{work['confidence']:.2f}"
         image_count = str(work.get('image_count', 0))
@@ -346,6 +378,45 @@ def generate_csv_report(works: List[Dict[str, Any]]) -> List[List[str]]:
     return rows
 
 
+# =============================================================================
+# Database Helpers
+# =============================================================================
+
+def get_work_type_counts(
+    db_conn: Any,
+    container_ids: List[int]
+) -> Dict[int, Dict[str, int]]:
+    """
+    Count works by type for each container with a single GROUP BY query.
+
+    Args:
+        db_conn: Database connection
+        container_ids: Container IDs to count
+
+    Returns:
+        Mapping of container_id -> {work_type: count}. Containers with no
+        works in the database are omitted.
+    """
+    if not container_ids:
+        return {}
+
+    placeholders = ','.join(['%s'] * len(container_ids))
+    query = f"""
+        SELECT occ.container_id, w.work_type, COUNT(*)
+        FROM work_occurrences_t occ
+        JOIN works_t w ON w.work_id = occ.work_id
+        WHERE occ.container_id IN ({placeholders})
+        GROUP BY occ.container_id, w.work_type
+    """
+
+    counts: Dict[int, Dict[str, int]] = {}
+    with db_conn.cursor() as cursor:
+        cursor.execute(query, list(container_ids))
+        for container_id, work_type, count in cursor.fetchall():
+            counts.setdefault(container_id, {})[work_type] = count
+    return counts
+
+
 # =============================================================================
 # Report Writing
 # =============================================================================
@@ -381,20 +452,78 @@ def write_csv_report(rows: List[List[str]], output_path: Path) -> bool:
 # Main Entry Point
 # =============================================================================
 
-def generate_reports(
+def _resolve_report_paths(
+    container_id: int,
+    manifest_path: Optional[Path],
+    segmentation_path: Optional[Path],
+    output_dir: Optional[Path]
+) -> Tuple[Path, Path, Path]:
+    """Fill in default 0220_Page_Packs locations for any path not provided."""
+    pack_dir = Path('0220_Page_Packs') / str(container_id)
+    if not manifest_path:
+        manifest_path = pack_dir / 'manifest.json'
+    if not segmentation_path:
+        segmentation_path = pack_dir / 'segmentation' / 'segmentation_v2_1.json'
+    if not output_dir:
+        output_dir = pack_dir / 'qa'
+    return manifest_path, segmentation_path, output_dir
+
+
+def _load_json(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load a JSON file, returning None if it does not exist.
+
+    With orjson available, files over MMAP_THRESHOLD_BYTES are parsed directly
+    from a read-only memory map instead of being read into a bytes object first.
+    """
+    if not path.exists():
+        return None
+    with open(path, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size > MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _render_and_write_html(
+    container_id: int,
+    manifest_data: Dict[str, Any],
+    segmentation_data: Optional[Dict[str, Any]],
+    type_counts: Optional[Dict[str, int]],
+    html_path: Path
+) -> bool:
+    """Render the HTML report and write it (runs in a worker thread)."""
+    html_content = generate_html_report(container_id, manifest_data, segmentation_data, type_counts)
+    return write_html_report(html_content, html_path)
+
+
+def _render_and_write_csv(works: List[Dict[str, Any]], csv_path: Path) -> bool:
+    """Render the CSV report and write it (runs in a worker thread)."""
+    return write_csv_report(generate_csv_report(works), csv_path)
+
+
+async def generate_reports_async(
     container_id: int,
     manifest_path: Optional[Path] = None,
     segmentation_path: Optional[Path] = None,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    type_counts: Optional[Dict[str, int]] = None
 ) -> Dict[str, Any]:
     """
     Generate QC reports for a container.
 
+    The DB-free stages (JSON load, HTML/CSV render, file write) run in worker
+    threads via asyncio.to_thread, so the manifest and segmentation loads
+    overlap, the HTML and CSV reports are produced concurrently, and several
+    containers can be processed at once with asyncio.gather.
+
     Args:
         container_id: Container ID
         manifest_path: Path to page pack manifest (auto-detected if None)
         segmentation_path: Path to segmentation manifest (auto-detected if None)
         output_dir: Output directory (defaults to 0220_Page_Packs/{id}/qa/)
+        type_counts: Optional work-type counts from the database
 
     Returns:
         Result dictionary with status and file paths
@@ -408,15 +537,9 @@ def generate_reports(
     }
 
     # Auto-detect manifest paths if not provided
-    if not manifest_path:
-        manifest_path = Path('0220_Page_Packs') / str(container_id) / 'manifest.json'
-
-    if not segmentation_path:
-        segmentation_path = (Path('0220_Page_Packs') / str(container_id) /
-                           'segmentation' / 'segmentation_v2_1.json')
-
-    if not output_dir:
-        output_dir = Path('0220_Page_Packs') / str(container_id) / 'qa'
+    manifest_path, segmentation_path, output_dir = _resolve_report_paths(
+        container_id, manifest_path, segmentation_path, output_dir
+    )
 
     logger.info(f"Generating QC reports for Container {container_id}")
     logger.debug(f"Manifest: {manifest_path}")
@@ -424,52 +547,56 @@ def generate_reports(
     logger.debug(f"Output: {output_dir}")
 
     try:
-        # Load manifest
-        if not manifest_path.exists():
+        # Load manifest and segmentation (optional) concurrently
+        manifest_data, segmentation_data = await asyncio.gather(
+            asyncio.to_thread(_load_json, manifest_path),
+            asyncio.to_thread(_load_json, segmentation_path),
+        )
+
+        if manifest_data is None:
             result['status'] = 'error'
             result['error_message'] = f"Manifest not found: {manifest_path}"
             logger.error(result['error_message'])
             return result
 
-        with open(manifest_path) as f:
-            manifest_data = json.load(f)
-
-        # Load segmentation (optional)
-        segmentation_data = None
-        if segmentation_path.exists():
-            with open(segmentation_path) as f:
-                segmentation_data = json.load(f)
+        if segmentation_data is not None:
             logger.info(f"Loaded segmentation with {len(segmentation_data.get('works', []))} works")
         else:
             logger.warning(f"Segmentation not found: {segmentation_path}")
 
-        # Generate HTML report
-        html_content = generate_html_report(
-            container_id,
-            manifest_data,
-            segmentation_data
-        )
-
+        # Generate HTML and CSV reports concurrently
         html_path = output_dir / 'qc_report.html'
-        if write_html_report(html_content, html_path):
+        csv_path = output_dir / 'qc_report.csv'
+        tasks = [
+            asyncio.to_thread(
+                _render_and_write_html,
+                container_id,
+                manifest_data,
+                segmentation_data,
+                type_counts,
+                html_path
+            )
+        ]
+        if segmentation_data:
+            works = segmentation_data.get('works', [])
+            tasks.append(asyncio.to_thread(_render_and_write_csv, works, csv_path))
+        else:
+            logger.info('Skipping CSV report (no segmentation data)')
+
+        html_ok, *csv_ok = await asyncio.gather(*tasks)
+
+        if html_ok:
             result['html_report'] = str(html_path)
         else:
             result['status'] = 'error'
             result['error_message'] = 'Failed to write HTML report'
             return result
 
-        # Generate CSV report
-        if segmentation_data:
-            works = segmentation_data.get('works', [])
-            csv_rows = generate_csv_report(works)
-
-            csv_path = output_dir / 'qc_report.csv'
-            if write_csv_report(csv_rows, csv_path):
+        if csv_ok:
+            if csv_ok[0]:
                 result['csv_report'] = str(csv_path)
             else:
                 logger.warning('Failed to write CSV report')
-        else:
-            logger.info('Skipping CSV report (no segmentation data)')
 
         result['status'] = 'success'
         logger.info(f"QC reports generated successfully")
@@ -482,6 +609,44 @@ def generate_reports(
         return result
 
 
+def generate_reports(
+    container_id: int,
+    manifest_path: Optional[Path] = None,
+    segmentation_path: Optional[Path] = None,
+    output_dir: Optional[Path] = None,
+    db_conn: Any = None
+) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around generate_reports_async for a single container.
+
+    If db_conn is given, work-type counts come from the database; otherwise
+    (or if the database has no works for the container) they are counted
+    from the segmentation JSON.
+    """
+    type_counts = None
+    if db_conn is not None:
+        type_counts = get_work_type_counts(db_conn, [container_id]).get(container_id)
+    return asyncio.run(generate_reports_async(
+        container_id,
+        manifest_path,
+        segmentation_path,
+        output_dir,
+        type_counts
+    ))
+
+
+async def generate_reports_batch(
+    container_ids: List[int],
+    db_conn: Any = None
+) -> List[Dict[str, Any]]:
+    """Generate QC reports for several containers concurrently (default paths)."""
+    all_counts = get_work_type_counts(db_conn, container_ids) if db_conn is not None else {}
+    return await asyncio.gather(*(
+        generate_reports_async(container_id, type_counts=all_counts.get(container_id))
+        for container_id in container_ids
+    ))
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -490,8 +655,9 @@ def main():
     parser.add_argument(
         '--container-id',
         type=int,
+        nargs='+',
         required=True,
-        help='Container ID'
+        help='Container ID(s)'
     )
     parser.add_argument(
         '--manifest-path',
@@ -508,26 +674,49 @@ def main():
         type=Path,
         help='Output directory for reports'
     )
+    parser.add_argument(
+        '--use-db',
+        action='store_true',
+        help='Take work-type counts from the database instead of the segmentation JSON'
+    )
 
     args = parser.parse_args()
 
-    result = generate_reports(
-        args.container_id,
-        args.manifest_path,
-        args.segmentation_path,
-        args.output_dir
-    )
+    if len(args.container_id) > 1 and (args.manifest_path or args.segmentation_path or args.output_dir):
+        parser.error('--manifest-path, --segmentation-path and --output-dir '
+                     'require a single --container-id')
+
+    with ExitStack() as stack:
+        db_conn = None
+        if args.use_db:
+            sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+            from scripts.common import hjb_db
+            db_conn = stack.enter_context(hjb_db.get_connection())
+
+        if len(args.container_id) > 1:
+            results = asyncio.run(generate_reports_batch(args.container_id, db_conn))
+        else:
+            results = [generate_reports(
+                args.container_id[0],
+                args.manifest_path,
+                args.segmentation_path,
+                args.output_dir,
+                db_conn
+            )]
+
+    failed = 0
+    for result in results:
+        if result['status'] == 'success':
+            logger.info(f"\n[SUCCESS] Reports generated for Container {result['container_id']}")
+            if result['html_report']:
+                logger.info(f"  HTML: {result['html_report']}")
+            if result['csv_report']:
+                logger.info(f"  CSV: {result['csv_report']}")
+        else:
+            failed += 1
+            logger.error(f"\n[FAILED] Container {result['container_id']}: {result['error_message']}")
 
-    if result['status'] == 'success':
-        logger.info(f"\n[SUCCESS] Reports generated")
-        if result['html_report']:
-            logger.info(f"  HTML: {result['html_report']}")
-        if result['csv_report']:
-            logger.info(f"  CSV: {result['csv_report']}")
-        return 0
-    else:
-        logger.error(f"\n[FAILED] {result['error_message']}")
-        return 1
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
@@ -18,17 +18,29 @@ Usage:
     python scripts/stage1/backfill_issues.py --family-id 1 --verbose
 """
 
+import csv
+import os
 import sys
 import logging
+import tempfile
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from mysql.connector import Error as MySQLError
+
 from scripts.common import hjb_db
-from scripts.stage1.ia_acquire import create_issue_from_parsed
-from scripts.stage1.parse_american_architect_ia import parse_american_architect_identifier
+from scripts.stage1.ia_acquire import (
+    INSERT_ISSUE_SQL,
+    issue_values_from_parsed,
+)
+from scripts.stage1.parse_american_architect_ia import (
+    ParsedIAIdentifier,
+    parse_american_architect_identifier,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,117 +48,314 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# Containers per batch: one multi-row issues_t insert and one
+# issue_containers_t executemany() per batch (keeps packets well under
+# max_allowed_packet)
+BATCH_SIZE = 1000
+
+_INSERT_ISSUE_CONTAINER_SQL = """
+    INSERT INTO issue_containers_t
+    (issue_id, container_id, is_preferred, is_complete)
+    VALUES (%s, %s, 1, 1)
+    ON DUPLICATE KEY UPDATE is_preferred = 1
+"""
+
+# Bulk-load path for the same rows. IGNORE instead of ON DUPLICATE KEY UPDATE
+# (LOAD DATA has no upsert): rows that hit a duplicate key or a foreign key
+# error are dropped with a warning, so the loaded count comes from rowcount.
+_LOAD_ISSUE_CONTAINERS_SQL = """
+    LOAD DATA LOCAL INFILE %s
+    IGNORE INTO TABLE issue_containers_t
+    FIELDS TERMINATED BY ','
+    LINES TERMINATED BY '\\n'
+    (issue_id, container_id)
+    SET is_preferred = 1, is_complete = 1
+"""
+
+# Error numbers meaning LOCAL INFILE was refused rather than the load failing:
+# ER_NOT_ALLOWED_COMMAND, ER_CLIENT_LOCAL_FILES_DISABLED (server side) and
+# CR_LOAD_DATA_LOCAL_INFILE_REJECTED (client side)
+_LOCAL_INFILE_REFUSED_ERRNOS = {1148, 3948, 2068}
+
+# Cleared the first time the server (or client) refuses LOCAL INFILE
+_local_infile_ok = True
 
-def get_containers_without_issues(family_id: Optional[int] = None) -> List[Dict[str, Any]]:
+
+def get_containers_without_issues(
+    family_id: Optional[int] = None,
+    conn: Any = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    Get all containers that don't have issue_containers_t entries.
+    Stream all containers that don't have issue_containers_t entries.
+
+    Rows are fetched in keyset-paged chunks of BATCH_SIZE (container_id
+    above the last one seen), so memory stays flat regardless of how many
+    containers match, and no result set is held open on the server while
+    the caller works through a page. Results are ordered by container_id
+    so an interrupted run can be resumed.
 
     Args:
         family_id: Optional filter by family
+        conn: Optional open connection to reuse
 
-    Returns:
-        List of container dicts with container_id, source_identifier, family_id, title_id
+    Yields:
+        Container dicts with container_id, source_identifier, family_id, title_id
     """
-    with hjb_db.get_connection() as conn:
+    # Find containers without issue_containers_t entries
+    sql = """
+        SELECT c.container_id, c.source_identifier, c.family_id, c.title_id
+        FROM containers_t c
+        LEFT JOIN issue_containers_t ic ON c.container_id = ic.container_id
+        WHERE ic.issue_container_id IS NULL
+          AND c.source_system = 'internet_archive'
+          AND c.container_id > %s
+    """
+
+    params: List[Any] = []
+    if family_id:
+        sql += " AND c.family_id = %s"
+        params.append(family_id)
+
+    sql += " ORDER BY c.container_id LIMIT %s"
+
+    with _connection_scope(conn) as conn:
         if not conn:
-            return []
+            return
+
+        last_id = 0
+        while True:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(sql, [last_id, *params, BATCH_SIZE])
+                page = cursor.fetchall()
+            finally:
+                cursor.close()
+
+            yield from page
+            if len(page) < BATCH_SIZE:
+                return
+            last_id = page[-1]['container_id']
 
-        cursor = conn.cursor(dictionary=True)
 
-        # Find containers without issue_containers_t entries
-        sql = """
-            SELECT c.container_id, c.source_identifier, c.family_id, c.title_id
-            FROM containers_t c
-            LEFT JOIN issue_containers_t ic ON c.container_id = ic.container_id
-            WHERE ic.issue_container_id IS NULL
-              AND c.source_system = 'internet_archive'
-        """
+def _connection_scope(conn: Any = None, local_infile: bool = False):
+    """Use the caller's connection if given (left open), else open a new one."""
+    return nullcontext(conn) if conn is not None else hjb_db.get_connection(local_infile=local_infile)
 
+
+def get_family_code_map(family_id: Optional[int] = None, conn: Any = None) -> Dict[int, str]:
+    """
+    Fetch family_id -> family_code for all families (or just one) in one query.
+
+    Args:
+        family_id: Optional filter by family
+        conn: Optional open connection to reuse
+
+    Returns:
+        Dict mapping family_id to family_code
+    """
+    with _connection_scope(conn) as conn:
+        if not conn:
+            return {}
+
+        cursor = conn.cursor()
+
+        sql = "SELECT family_id, family_code FROM publication_families_t"
         params = []
         if family_id:
-            sql += " AND c.family_id = %s"
+            sql += " WHERE family_id = %s"
             params.append(family_id)
 
         cursor.execute(sql, params)
-        results = cursor.fetchall()
+        family_codes = {fid: code for fid, code in cursor.fetchall()}
         cursor.close()
 
-        return results
-
+        return family_codes
 
-def create_issue_and_link(
-    container_id: int,
-    source_identifier: str,
-    family_id: int,
-    title_id: Optional[int],
-    dry_run: bool = False
-) -> bool:
-    """
-    Create issue from identifier and link to container.
 
-    Returns:
-        True if successful, False otherwise
-    """
-    # Parse identifier
+def parse_container_identifier(source_identifier: str) -> Optional[ParsedIAIdentifier]:
+    """Parse a container's IA identifier, logging the outcome."""
     parsed = parse_american_architect_identifier(source_identifier)
     if not parsed:
         log.warning(f"Could not parse identifier: {source_identifier}")
-        return False
+        return None
 
     log.info(f"Parsed {source_identifier}: {parsed.issue_label}, Vol {parsed.volume_label}")
+    return parsed
+
+
+def _select_issue_ids(cursor: Any, canonical_keys: List[str]) -> Dict[str, int]:
+    """Look up issue_id for each canonical_issue_key that already exists."""
+    if not canonical_keys:
+        return {}
+    placeholders = ", ".join(["%s"] * len(canonical_keys))
+    cursor.execute(
+        f"SELECT canonical_issue_key, issue_id FROM issues_t "
+        f"WHERE canonical_issue_key IN ({placeholders})",
+        canonical_keys,
+    )
+    return {key: issue_id for key, issue_id in cursor.fetchall()}
 
-    if dry_run:
-        # Get family_code for display
-        family_code = None
-        with hjb_db.get_connection() as conn:
-            if conn:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute(
-                    "SELECT family_code FROM publication_families_t WHERE family_id = %s",
-                    (family_id,)
-                )
-                result = cursor.fetchone()
-                if result:
-                    family_code = result['family_code']
-                cursor.close()
 
-        log.info(f"  [DRY RUN] Would create issue: {parsed.canonical_issue_key(family_code)}")
-        return True
+def _insert_issues_singly(cursor: Any, conn: Any, new_issues: Dict[str, Tuple[Any, ...]]) -> None:
+    """Insert and commit issues one at a time, logging (and skipping) any that fail."""
+    for key, values in new_issues.items():
+        try:
+            cursor.execute(INSERT_ISSUE_SQL, values)
+            conn.commit()
+        except MySQLError as e:
+            conn.rollback()
+            log.error(f"Failed to create issue {key}: {e}")
 
-    # Create issue (this also handles the issue_containers_t mapping internally now)
-    issue_id = create_issue_from_parsed(
-        parsed=parsed,
-        family_id=family_id,
-        title_id=title_id,
-    )
 
-    if not issue_id:
-        log.error(f"Failed to create issue for {source_identifier}")
-        return False
+def create_issues_bulk(
+    records: List[Tuple[ParsedIAIdentifier, int, Optional[int], int]],
+    family_code_map: Dict[int, str],
+    conn: Any = None,
+) -> Dict[int, int]:
+    """
+    Create issues_t rows for a batch of containers.
+
+    Issues that already exist (by canonical_issue_key) are reused. The rest
+    go in with a single executemany() - sent as one multi-row INSERT - and
+    one commit, and their ids are read back by canonical_issue_key. If the
+    batch insert fails it is rolled back and retried one issue (and commit)
+    at a time, so a bad row only loses its own containers.
+
+    Args:
+        records: (parsed, family_id, title_id, container_id) tuples, at most
+            BATCH_SIZE of them
+        family_code_map: family_id -> family_code (see get_family_code_map)
+        conn: Optional open connection to reuse
+
+    Returns:
+        Dict mapping container_id to issue_id; containers whose issue could
+        not be created are left out
+    """
+    if not records:
+        return {}
+
+    keyed = [
+        (parsed.canonical_issue_key(family_code_map.get(family_id)), parsed, family_id, title_id, container_id)
+        for parsed, family_id, title_id, container_id in records
+    ]
 
-    # Create issue_containers_t mapping
-    with hjb_db.get_connection() as conn:
+    with _connection_scope(conn) as conn:
         if not conn:
-            return False
+            return {}
 
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT INTO issue_containers_t
-                (issue_id, container_id, is_preferred, is_complete)
-                VALUES (%s, %s, 1, 1)
-                ON DUPLICATE KEY UPDATE is_preferred = 1
-            """, (issue_id, container_id))
+            issue_ids = _select_issue_ids(cursor, list(dict.fromkeys(k[0] for k in keyed)))
+
+            new_issues: Dict[str, Tuple[Any, ...]] = {}
+            for key, parsed, family_id, title_id, _ in keyed:
+                if key not in issue_ids and key not in new_issues:
+                    new_issues[key] = issue_values_from_parsed(parsed, family_id, title_id, key)
+
+            if new_issues:
+                try:
+                    cursor.executemany(INSERT_ISSUE_SQL, list(new_issues.values()))
+                    conn.commit()
+                except MySQLError as e:
+                    conn.rollback()
+                    log.warning(f"Batch insert of {len(new_issues)} issues failed ({e}); retrying one at a time")
+                    _insert_issues_singly(cursor, conn, new_issues)
+                created = _select_issue_ids(cursor, list(new_issues))
+                issue_ids.update(created)
+                log.info(f"  ✓ Created {len(created)} issues")
+
+            return {
+                container_id: issue_ids[key]
+                for key, _, _, _, container_id in keyed
+                if key in issue_ids
+            }
 
-            conn.commit()
-            log.info(f"  ✓ Created issue {issue_id} and linked to container {container_id}")
-            return True
+        except Exception as e:
+            log.error(f"Failed to create issues for batch of {len(records)}: {e}")
+            conn.rollback()
+            return {}
+        finally:
+            cursor.close()
+
+
+def _load_issue_containers(cursor: Any, batch: List[Tuple[int, int]]) -> int:
+    """
+    Bulk-load (issue_id, container_id) pairs from a temp CSV via LOAD DATA
+    LOCAL INFILE. Returns the number of rows actually loaded (rows skipped
+    by IGNORE are not counted).
+    """
+    fd, csv_path = tempfile.mkstemp(prefix="hjb_issue_containers_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            csv.writer(f, lineterminator="\n").writerows(batch)
+        cursor.execute(_LOAD_ISSUE_CONTAINERS_SQL, (csv_path,))
+        return max(cursor.rowcount, 0)
+    finally:
+        os.unlink(csv_path)
+
+
+def link_issues_to_containers(pairs: List[Tuple[int, int]], conn: Any = None) -> int:
+    """
+    Insert issue_containers_t mappings in batches of BATCH_SIZE.
+
+    Each batch is bulk-loaded with LOAD DATA LOCAL INFILE and committed. If
+    local_infile is disabled on either end, falls back (for the rest of the
+    run) to one executemany() + commit per batch. Any other error (deadlock,
+    lost connection, ...) is handled like a failed INSERT: logged, and the
+    remaining batches are not linked.
+
+    Args:
+        pairs: List of (issue_id, container_id) tuples
+        conn: Optional open connection to reuse; it must have been opened
+            with local_infile=True for the LOAD DATA path
+
+    Returns:
+        Number of pairs successfully linked
+    """
+    global _local_infile_ok
+
+    if not pairs:
+        return 0
+
+    linked = 0
+    with _connection_scope(conn, local_infile=True) as conn:
+        if not conn:
+            return 0
+
+        cursor = conn.cursor()
+
+        try:
+            for start in range(0, len(pairs), BATCH_SIZE):
+                batch = pairs[start:start + BATCH_SIZE]
+                loaded = None
+                if _local_infile_ok:
+                    try:
+                        loaded = _load_issue_containers(cursor, batch)
+                    except MySQLError as e:
+                        if e.errno not in _LOCAL_INFILE_REFUSED_ERRNOS:
+                            raise
+                        log.warning(f"LOAD DATA LOCAL INFILE not available ({e}); using INSERT")
+                        conn.rollback()
+                        _local_infile_ok = False
+                if not _local_infile_ok:
+                    # Upsert: every row is linked or the statement raises
+                    cursor.executemany(_INSERT_ISSUE_CONTAINER_SQL, batch)
+                    loaded = len(batch)
+                conn.commit()
+                if loaded < len(batch):
+                    log.warning(
+                        f"  {len(batch) - loaded} of {len(batch)} mappings skipped by LOAD DATA "
+                        f"(duplicate or missing issue/container)"
+                    )
+                linked += loaded
+            log.info(f"  ✓ Linked {linked} issues to containers")
+            return linked
 
         except Exception as e:
-            log.error(f"Failed to create issue_containers_t mapping: {e}")
+            log.error(f"Failed to create issue_containers_t mappings: {e}")
             conn.rollback()
-            return False
+            return linked
         finally:
             cursor.close()
 
@@ -169,24 +378,41 @@ def main() -> int:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    # Get containers without issues
-    log.info("Finding containers without issues...")
-    containers = get_containers_without_issues(args.family_id)
+    # One long-lived connection for the whole run: the container pages,
+    # issue inserts and links (whose LOAD DATA step needs local_infile).
+    # Each container page is read in full before any of it is written, so
+    # the reads and writes never overlap on it.
+    with hjb_db.get_connection(local_infile=True) as conn:
+        return run_backfill(conn, args.family_id, args.dry_run)
 
-    if not containers:
-        log.info("No containers found needing issues. All done!")
-        return 0
 
-    log.info(f"Found {len(containers)} containers without issues")
+def run_backfill(conn: Any, only_family_id: Optional[int], dry_run: bool) -> int:
+    """Process every container missing an issue, reusing conn for all writes."""
+    # Get containers without issues
+    log.info("Finding containers without issues...")
+    containers = get_containers_without_issues(only_family_id, conn=conn)
 
-    if args.dry_run:
+    if dry_run:
         log.info("\n=== DRY RUN MODE ===\n")
+    family_code_map = get_family_code_map(only_family_id, conn=conn)
 
-    # Process each
+    # Parse each; issues and their issue_containers_t rows are written in batches
     success_count = 0
     fail_count = 0
-
+    pending: List[Tuple[ParsedIAIdentifier, int, Optional[int], int]] = []
+
+    def flush() -> None:
+        nonlocal success_count, fail_count
+        issue_ids = create_issues_bulk(pending, family_code_map, conn=conn)
+        pairs = [(issue_ids[cid], cid) for *_, cid in pending if cid in issue_ids]
+        linked = link_issues_to_containers(pairs, conn=conn)
+        success_count += linked
+        fail_count += len(pending) - linked
+        pending.clear()
+
+    total_count = 0
     for container in containers:
+        total_count += 1
         container_id = container['container_id']
         source_identifier = container['source_identifier']
         family_id = container['family_id']
@@ -194,28 +420,35 @@ def main() -> int:
 
         log.info(f"\nProcessing container {container_id}: {source_identifier}")
 
-        success = create_issue_and_link(
-            container_id=container_id,
-            source_identifier=source_identifier,
-            family_id=family_id,
-            title_id=title_id,
-            dry_run=args.dry_run
-        )
+        parsed = parse_container_identifier(source_identifier)
 
-        if success:
+        if parsed is None:
+            fail_count += 1
+        elif dry_run:
+            family_code = family_code_map.get(family_id)
+            log.info(f"  [DRY RUN] Would create issue: {parsed.canonical_issue_key(family_code)}")
             success_count += 1
         else:
-            fail_count += 1
+            pending.append((parsed, family_id, title_id, container_id))
+            if len(pending) >= BATCH_SIZE:
+                flush()
+
+    if pending:
+        flush()
+
+    if total_count == 0:
+        log.info("No containers found needing issues. All done!")
+        return 0
 
     # Summary
     log.info("\n" + "=" * 60)
     log.info("SUMMARY")
     log.info("=" * 60)
-    log.info(f"Total containers: {len(containers)}")
+    log.info(f"Total containers: {total_count}")
     log.info(f"Successfully processed: {success_count}")
     log.info(f"Failed: {fail_count}")
 
-    if args.dry_run:
+    if dry_run:
         log.info("\nThis was a dry run. Run without --dry-run to apply changes.")
 
     return 0 if fail_count == 0 else 1
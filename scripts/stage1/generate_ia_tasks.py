@@ -22,26 +22,55 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
-import io
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+# Optional accelerator for flag serialization
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
 
-# Pre-compiled regex for identifier filtering (case-insensitive)
-_FILTER_PATTERN = re.compile(r'_(?:index|superceded|supplemental)', re.IGNORECASE)
 
+# One identifier per line: leading/trailing whitespace trimmed, blank and
+# '#' comment lines never match
+_LINE_RE = re.compile(r'^\s*([^#\s].*?)\s*$', re.MULTILINE)
 
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
+# Placeholders substituted per task when rendering from a batch template
+_IDENT_PLACEHOLDER = "@@ia_identifier@@"
+_NUMBER_PLACEHOLDER = "@@task_number@@"
 
-def utc_now_compact() -> str:
+# Flag writes are small-file creates; on the NAS they are bound by round-trips
+DEFAULT_WORKERS = 16
+
+# Hidden subdirectory of the output dir used by staged writes; the watcher
+# only globs *.json at the top level of flags/pending
+STAGING_DIRNAME = ".staging"
+
+_FLAG_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def utc_now_iso(now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return now.isoformat(timespec="seconds")
+
+
+def utc_now_compact(now: Optional[datetime] = None) -> str:
     """Generate compact UTC timestamp without colons/dashes for task IDs."""
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    now = now or datetime.now(timezone.utc)
+    return now.strftime("%Y%m%dT%H%M%SZ")
+
+
+def batch_timestamps() -> Tuple[str, str]:
+    """(compact stamp, ISO created_at) for a whole batch from one clock read."""
+    now = datetime.now(timezone.utc)
+    return utc_now_compact(now), utc_now_iso(now)
 
 
 def parse_identifiers(input_file: Path) -> list[str]:
@@ -52,13 +81,33 @@ def parse_identifiers(input_file: Path) -> list[str]:
     - Lines starting with 'sim_' (standard format)
     - Empty lines and comments (ignored)
     """
-    identifiers = []
-    for line in input_file.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        identifiers.append(line)
-    return identifiers
+    text = input_file.read_text(encoding="utf-8")
+    return _LINE_RE.findall(text)
+
+
+def parse_and_filter_identifiers(
+    input_file: Path,
+    limit: Optional[int] = None,
+) -> Tuple[int, list[str]]:
+    """
+    parse_identifiers() + filter_identifiers() in a single scan.
+
+    With a limit, only as much of the parsed list is filtered (in slices of
+    `limit`) as it takes to collect the first `limit` production identifiers.
+
+    Returns (number of identifiers parsed, production identifiers).
+    """
+    text = input_file.read_text(encoding="utf-8")
+    parsed = _LINE_RE.findall(text)
+    if not limit:
+        return len(parsed), filter_identifiers(parsed)
+
+    kept: list[str] = []
+    start = 0
+    while len(kept) < limit and start < len(parsed):
+        kept += filter_identifiers(parsed[start:start + limit])
+        start += limit
+    return len(parsed), kept[:limit]
 
 
 def filter_identifiers(identifiers: list[str]) -> list[str]:
@@ -73,8 +122,18 @@ def filter_identifiers(identifiers: list[str]) -> list[str]:
     We process these separately if needed, but for main acquisition
     we focus on regular issues.
     """
-    # Use pre-compiled regex for O(n) filtering instead of O(n*m)
-    return [ident for ident in identifiers if not _FILTER_PATTERN.search(ident)]
+    # Case-insensitive literal substring tests, inlined (no per-identifier
+    # function call or regex). The two "_su..." tokens share a prefix, so a
+    # regular identifier costs two scans. Matches anywhere, not just as a
+    # suffix, like the original _(?:index|superceded|supplemental) regex.
+    return [
+        ident
+        for ident in identifiers
+        if not (
+            "_index" in (lowered := ident.lower())
+            or ("_su" in lowered and ("_superceded" in lowered or "_supplemental" in lowered))
+        )
+    ]
 
 
 def generate_task_flag(
@@ -82,17 +141,22 @@ def generate_task_flag(
     family: str,
     task_number: int,
     total_tasks: int,
+    stamp: Optional[str] = None,
+    created_at: Optional[str] = None,
 ) -> dict:
     """
     Generate a single task flag JSON for this identifier.
+
+    Pass `stamp` / `created_at` (see batch_timestamps) to reuse one
+    timestamp across a batch instead of reading the clock per task.
     """
-    task_id = f"{utc_now_compact()}_{identifier}"
+    task_id = f"{stamp or utc_now_compact()}_{identifier}"
 
     return {
         "schema": "hjb.task.v1",
         "task_id": task_id,
         "task_type": "stage1.ia_download",
-        "created_at": utc_now_iso(),
+        "created_at": created_at or utc_now_iso(),
         "created_by": "generate_ia_tasks.py",
         "priority": "normal",
         "parameters": {
@@ -108,6 +172,122 @@ def generate_task_flag(
     }
 
 
+def dumps_task_flag(obj: Any) -> bytes:
+    """Serialize as 2-space indented, key-sorted JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True).encode("utf-8")
+
+
+def build_task_flag_template(
+    family: str, total_tasks: int, stamp: str, created_at: str
+) -> bytes:
+    """
+    Pre-render the task flag JSON for a batch as a bytes %-format template.
+
+    Everything except the identifier and task number is identical across a
+    batch, so the dict is built and serialized once; per task we only
+    substitute the JSON-escaped identifier and the task number. Staying in
+    bytes skips a decode/encode per task. The result is byte-identical to
+    dumps_task_flag(generate_task_flag(...)).
+    """
+    task = generate_task_flag(
+        _IDENT_PLACEHOLDER, family, 0, total_tasks, stamp=stamp, created_at=created_at
+    )
+    task["metadata"]["batch_info"] = f"Task {_NUMBER_PLACEHOLDER} of {total_tasks}"
+    return (
+        dumps_task_flag(task)
+        .replace(b"%", b"%%")
+        .replace(_IDENT_PLACEHOLDER.encode(), b"%(ia_identifier)s")
+        .replace(_NUMBER_PLACEHOLDER.encode(), b"%(task_number)d")
+    )
+
+
+def render_task_flag(template: bytes, identifier: str, task_number: int) -> bytes:
+    """Fill a batch template for one identifier; returns the JSON payload."""
+    # Strip the quotes to get the escaped body of the JSON string literal
+    escaped = dumps_task_flag(identifier)[1:-1]
+    return template % {b"ia_identifier": escaped, b"task_number": task_number}
+
+
+def write_task_flag(output_path: Path, payload: bytes) -> None:
+    """
+    Write a flag file with raw os-level calls (no text/buffer layers).
+
+    Deliberately no fsync, per file or on the directory: on the NAS each
+    one is another round-trip, and a flag lost to a crash is simply
+    regenerated (the watcher treats flags idempotently).
+    """
+    fd = os.open(output_path, _FLAG_OPEN_FLAGS, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            # os.write may write less than asked (e.g. interrupted SMB writes)
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_flag_for(
+    output_dir: Path,
+    template: bytes,
+    stamp: str,
+    identifier: str,
+    task_number: int,
+    staging_dir: Optional[Path] = None,
+) -> Path:
+    name = f"{stamp}_{identifier}.json"
+    payload = render_task_flag(template, identifier, task_number)
+    if staging_dir is None:
+        output_path = output_dir / name
+        write_task_flag(output_path, payload)
+        return output_path
+    # Write out of the watcher's sight, then publish with one atomic rename
+    staged = os.path.join(staging_dir, name)
+    write_task_flag(staged, payload)
+    output_path = output_dir / name
+    os.replace(staged, output_path)
+    return output_path
+
+
+def write_task_flags(
+    identifiers: List[str],
+    output_dir: Path,
+    template: bytes,
+    stamp: str,
+    workers: int = DEFAULT_WORKERS,
+    staging: bool = False,
+) -> Iterator[Tuple[int, Optional[Path], Optional[Exception]]]:
+    """
+    Write flag files on a thread pool.
+
+    Yields (task_number, output_path, error) in completion order; exactly one
+    of output_path / error is set. Order doesn't matter since each file is
+    addressed by its task_id.
+
+    With staging, each flag is written under output_dir/.staging/ and then
+    os.replace()d into output_dir, so a watcher polling output_dir never
+    claims a half-written flag (costs one extra rename per file).
+    """
+    staging_dir = None
+    if staging:
+        staging_dir = output_dir / STAGING_DIRNAME
+        staging_dir.mkdir(exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(
+                _write_flag_for, output_dir, template, stamp, identifier, i, staging_dir
+            ): i
+            for i, identifier in enumerate(identifiers, 1)
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as ex:
+                yield futures[future], None, ex
+
+
 def generate_tasks(
     identifiers_file: Path,
     output_dir: Path,
@@ -118,6 +298,8 @@ def generate_tasks(
     include_superceded: bool = False,
     dry_run: bool = False,
     verbose: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    batch_staging: bool = False,
 ) -> Tuple[List[str], Dict[str, Any]]:
     """
     Core task generation logic.
@@ -132,6 +314,8 @@ def generate_tasks(
         include_superceded: Include _superceded identifiers
         dry_run: Don't actually write files
         verbose: Print progress
+        workers: Number of threads writing flag files
+        batch_staging: Write flags under .staging/ and rename them into place
 
     Returns:
         (outputs, metrics) tuple
@@ -142,21 +326,21 @@ def generate_tasks(
     if not dry_run:
         output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Parse identifiers
-    all_identifiers = parse_identifiers(identifiers_file)
-    if verbose:
-        print(f"[*] Parsed {len(all_identifiers)} identifiers from {identifiers_file}")
-
-    # Filter (unless overridden)
+    # Parse identifiers, filtering in the same pass (unless overridden)
     if not include_index and not include_supplemental and not include_superceded:
-        filtered = filter_identifiers(all_identifiers)
-        skipped = len(all_identifiers) - len(filtered)
+        total_identifiers, identifiers = parse_and_filter_identifiers(identifiers_file, max_tasks)
         if verbose:
-            print(f"[*] Filtered to {len(filtered)} regular issues (skipped {skipped})")
-        identifiers = filtered
+            print(f"[*] Parsed {total_identifiers} identifiers from {identifiers_file}")
+            if max_tasks:
+                print(f"[*] Filtered to the first {len(identifiers)} regular issues")
+            else:
+                skipped = total_identifiers - len(identifiers)
+                print(f"[*] Filtered to {len(identifiers)} regular issues (skipped {skipped})")
     else:
-        identifiers = all_identifiers
+        identifiers = parse_identifiers(identifiers_file)
+        total_identifiers = len(identifiers)
         if verbose:
+            print(f"[*] Parsed {total_identifiers} identifiers from {identifiers_file}")
             print(f"[*] Using all {len(identifiers)} identifiers (filter disabled)")
 
     # Limit if requested
@@ -171,27 +355,27 @@ def generate_tasks(
     failed_count = 0
     output_files: List[str] = []
 
-    for i, identifier in enumerate(identifiers, 1):
-        try:
-            task = generate_task_flag(identifier, family, i, total)
+    # One timestamp per batch: task IDs stay unique because they embed the identifier
+    stamp, created_at = batch_timestamps()
 
-            if dry_run:
-                if verbose:
-                    print(f"[DRY] Task {i}/{total}: {task['task_id']}")
-            else:
-                output_path = output_dir / f"{task['task_id']}.json"
-                output_path.write_text(
-                    json.dumps(task, indent=2, sort_keys=True),
-                    encoding="utf-8",
-                )
-                output_files.append(str(output_path))
-                created_count += 1
-                if verbose:
-                    print(f"[OK] Task {i}/{total}: {output_path.name}")
-
-        except Exception as ex:
-            print(f"[ERROR] Task {i}/{total}: {ex}", file=sys.stderr)
-            failed_count += 1
+    if dry_run:
+        # Task IDs only: no flag template is rendered
+        if verbose:
+            for i, identifier in enumerate(identifiers, 1):
+                print(f"[DRY] Task {i}/{total}: {stamp}_{identifier}")
+    else:
+        template = build_task_flag_template(family, total, stamp, created_at)
+        for i, output_path, error in write_task_flags(
+            identifiers, output_dir, template, stamp, workers, batch_staging
+        ):
+            if error is not None:
+                print(f"[ERROR] Task {i}/{total}: {error}", file=sys.stderr)
+                failed_count += 1
+                continue
+            output_files.append(str(output_path))
+            created_count += 1
+            if verbose:
+                print(f"[OK] Task {i}/{total}: {output_path.name}")
 
     outputs = [str(output_dir)]
     metrics = {
@@ -203,7 +387,8 @@ def generate_tasks(
         "include_supplemental": include_supplemental,
         "include_superceded": include_superceded,
         "dry_run": dry_run,
-        "total_identifiers": len(all_identifiers),
+        "batch_staging": batch_staging,
+        "total_identifiers": total_identifiers,
         "filtered_identifiers": total,
         "generated_task_files": created_count,
         "failed_count": failed_count,
@@ -232,7 +417,9 @@ def execute_from_manifest(
             "include_supplemental": false,
             "include_superceded": false,
             "dry_run": false,
-            "verbose": true
+            "verbose": true,
+            "workers": 16,
+            "batch_staging": false
         }
     }
 
@@ -265,6 +452,8 @@ def execute_from_manifest(
     include_superceded = parameters.get("include_superceded", False)
     dry_run = parameters.get("dry_run", False)
     verbose = parameters.get("verbose", True)
+    workers = int(parameters.get("workers", DEFAULT_WORKERS))
+    batch_staging = bool(parameters.get("batch_staging", False))
 
     # Resolve paths
     repo_root = Path(__file__).resolve().parents[2]
@@ -289,6 +478,8 @@ def execute_from_manifest(
         include_superceded=include_superceded,
         dry_run=dry_run,
         verbose=verbose,
+        workers=workers,
+        batch_staging=batch_staging,
     )
 
 
@@ -344,6 +535,17 @@ def main() -> int:
         action="store_true",
         help="Verbose output",
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Parallel flag-file writers (default: {DEFAULT_WORKERS})",
+    )
+    ap.add_argument(
+        "--batch-staging",
+        action="store_true",
+        help=f"Write flags under {STAGING_DIRNAME}/ first and rename them into place",
+    )
     args = ap.parse_args()
 
     # Validate inputs
@@ -359,25 +561,24 @@ def main() -> int:
             print(f"ERROR: Output path is not a directory: {args.output_dir}", file=sys.stderr)
             return 1
 
-    # Parse identifiers
-    all_identifiers = parse_identifiers(args.identifiers)
-    if args.verbose:
-        print(f"[*] Parsed {len(all_identifiers)} identifiers from {args.identifiers}")
-
-    # Filter (unless overridden)
+    # Parse identifiers, filtering in the same pass (unless overridden)
     if (
         not args.include_index
         and not args.include_supplemental
         and not args.include_superceded
     ):
-        filtered = filter_identifiers(all_identifiers)
-        skipped = len(all_identifiers) - len(filtered)
+        total_identifiers, identifiers = parse_and_filter_identifiers(args.identifiers, args.max_tasks)
         if args.verbose:
-            print(f"[*] Filtered to {len(filtered)} regular issues (skipped {skipped})")
-        identifiers = filtered
+            print(f"[*] Parsed {total_identifiers} identifiers from {args.identifiers}")
+            if args.max_tasks:
+                print(f"[*] Filtered to the first {len(identifiers)} regular issues")
+            else:
+                skipped = total_identifiers - len(identifiers)
+                print(f"[*] Filtered to {len(identifiers)} regular issues (skipped {skipped})")
     else:
-        identifiers = all_identifiers
+        identifiers = parse_identifiers(args.identifiers)
         if args.verbose:
+            print(f"[*] Parsed {len(identifiers)} identifiers from {args.identifiers}")
             print(f"[*] Using all {len(identifiers)} identifiers (filter disabled)")
 
     # Limit if requested
@@ -397,26 +598,25 @@ def main() -> int:
     print(f"Dry run: {args.dry_run}")
     print(f"{'='*70}\n")
 
-    for i, identifier in enumerate(identifiers, 1):
-        try:
-            task = generate_task_flag(identifier, args.family, i, total)
+    stamp, created_at = batch_timestamps()
 
-            if args.dry_run:
-                print(f"[DRY] Task {i}/{total}: {task['task_id']}")
-                if args.verbose:
-                    print(f"      Identifier: {identifier}")
-            else:
-                output_path = args.output_dir / f"{task['task_id']}.json"
-                output_path.write_text(
-                    json.dumps(task, indent=2, sort_keys=True),
-                    encoding="utf-8",
-                )
-                print(f"[OK] Task {i}/{total}: {output_path.name}")
-                created_count += 1
-
-        except Exception as ex:
-            print(f"[ERROR] Task {i}/{total}: {ex}", file=sys.stderr)
-            failed_count += 1
+    if args.dry_run:
+        # Task IDs only: no flag template is rendered
+        for i, identifier in enumerate(identifiers, 1):
+            print(f"[DRY] Task {i}/{total}: {stamp}_{identifier}")
+            if args.verbose:
+                print(f"      Identifier: {identifier}")
+    else:
+        template = build_task_flag_template(args.family, total, stamp, created_at)
+        for i, output_path, error in write_task_flags(
+            identifiers, args.output_dir, template, stamp, args.workers, args.batch_staging
+        ):
+            if error is not None:
+                print(f"[ERROR] Task {i}/{total}: {error}", file=sys.stderr)
+                failed_count += 1
+                continue
+            print(f"[OK] Task {i}/{total}: {output_path.name}")
+            created_count += 1
 
     # Summary
     print(f"\n{'='*70}")
@@ -439,4 +639,7 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    # UTF-8 console output (identifiers and paths may be non-ASCII). Done here
+    # rather than at import, so importers (the watcher, tests) keep their stdout.
+    sys.stdout.reconfigure(encoding="utf-8")
     raise SystemExit(main())
@@ -29,30 +29,127 @@ import argparse
 import csv
 import hashlib
 import os
+import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from fnmatch import fnmatch
+from fnmatch import translate
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple
 
+# SHA256 worker threads (hashlib releases the GIL while hashing, so threads
+# scale across cores and overlap reads)
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
 
-def _matches_any_glob(path_str: str, globs: List[str]) -> bool:
+# Flag archives are never inventoried (standard HJB convention)
+_HARD_EXCLUDE_MARKERS = (
+    f"{os.sep}flags{os.sep}completed{os.sep}",
+    f"{os.sep}flags{os.sep}failed{os.sep}",
+)
+_FLAG_ARCHIVE_DIRS = frozenset({"completed", "failed"})
+_FLAGS_DIR_SUFFIX = f"{os.sep}flags"
+
+# Rows handed to csv.writer.writerows() at a time
+WRITE_BATCH_SIZE = 1000
+
+# ISO-8601 UTC timestamp, filled from a time.gmtime() struct
+_MTIME_FORMAT = "%04d-%02d-%02dT%02d:%02d:%02d+00:00"
+
+# hashlib.file_digest (Python 3.11+) runs the read/update loop in C
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Linux/POSIX read-ahead hints (absent on Windows)
+_fadvise = getattr(os, "posix_fadvise", None)
+
+# Per-thread read buffer for the fallback hash loop (no bytes per chunk)
+_hash_buffers = threading.local()
+
+
+def _compile_globs(globs: Optional[List[str]]) -> Optional[Pattern[str]]:
+    """
+    Compile glob patterns into one alternation regex (None if no patterns).
+
+    Patterns get the same os.path.normcase treatment fnmatch applies, so
+    matching behaves exactly like any(fnmatch(path, g) for g in globs).
+    """
+    if not globs:
+        return None
+    return re.compile("|".join(translate(os.path.normcase(g)) for g in globs))
+
+
+def _matches_any_glob(path_str: str, globs_re: Pattern[str]) -> bool:
     """
     Windows-friendly glob matching against forward-slash-normalized paths.
     """
-    norm = path_str.replace("\\", "/")
-    return any(fnmatch(norm, g) for g in globs)
+    return globs_re.match(os.path.normcase(path_str.replace("\\", "/"))) is not None
+
+
+def _scan_tree(
+    top: str,
+    keep_dir: Callable[[str, os.DirEntry], bool],
+) -> Iterator[List[os.DirEntry]]:
+    """
+    Yield the file entries of each directory under top, in os.walk order.
 
+    Unlike os.walk the DirEntry objects are kept, so entry.stat() can reuse
+    the data scandir already fetched (free on Windows). Directory symlinks
+    are not followed and unreadable directories are skipped, as os.walk does.
+    keep_dir(top, entry) decides whether a subdirectory is traversed.
+    """
+    files: List[os.DirEntry] = []
+    dirs: List[os.DirEntry] = []
+    try:
+        with os.scandir(top) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(e)
+                elif not e.is_symlink():
+                    dirs.append(e)
+    except OSError:
+        return
+
+    yield files
+    for d in dirs:
+        if keep_dir(top, d):
+            yield from _scan_tree(d.path, keep_dir)
+
+
+def _compute_sha256(file_path: str) -> str:
+    """
+    Compute SHA256 hash of a file without a Python-level chunk loop.
 
-def _compute_sha256(file_path: Path) -> str:
-    """Compute SHA256 hash of a file in chunks to handle large files."""
-    h = hashlib.sha256()
+    Files go through hashlib.file_digest where available, else readinto() a
+    reused per-thread buffer. OpenSSL picks SHA-NI / ARMv8 SHA2 instructions
+    either way. Files are read, never memory-mapped: the tree is live (e.g.
+    ia_acquire rewrites .part files in place), and touching a mapping of a
+    file truncated underneath it raises SIGBUS, which can't be caught.
+    """
     try:
-        with file_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return h.hexdigest()
+        with open(file_path, "rb") as f:
+            if _fadvise is not None:
+                # Let the kernel read ahead aggressively while we hash. Only a
+                # hint: filesystems that refuse it (some NAS/SMB mounts) are
+                # still hashed
+                try:
+                    _fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            if _file_digest is not None:
+                return _file_digest(f, "sha256").hexdigest()
+            h = hashlib.sha256()
+            buf = getattr(_hash_buffers, "view", None)
+            if buf is None:
+                buf = _hash_buffers.view = memoryview(bytearray(1024 * 1024))
+            while n := f.readinto(buf):
+                h.update(buf[:n])
+            return h.hexdigest()
     except OSError:
         return ""
 
@@ -67,6 +164,7 @@ def generate_inventory(
     max_files: int = 100000,
     max_seconds: int = 1800,
     verbose: bool = False,
+    hash_workers: int = DEFAULT_HASH_WORKERS,
 ) -> Tuple[List[str], Dict[str, Any]]:
     """
     Generate CSV inventory of files in specified directories.
@@ -81,6 +179,7 @@ def generate_inventory(
         max_files: Stop after this many files (0 = unlimited)
         max_seconds: Stop after this many seconds (0 = unlimited)
         verbose: Print progress information
+        hash_workers: Threads computing SHA256 hashes (rows keep scan order)
 
     Returns:
         (outputs, metrics) tuple where:
@@ -88,6 +187,7 @@ def generate_inventory(
             metrics: Dict with inventory statistics
     """
     started = time.monotonic()
+    deadline = started + max_seconds if max_seconds else float("inf")
     stopped_reason: Optional[str] = None
 
     # Ensure output directory exists
@@ -105,6 +205,9 @@ def generate_inventory(
     files_seen = 0
     bytes_seen = 0
 
+    include_re = _compile_globs(include_globs)
+    exclude_re = _compile_globs(exclude_globs)
+
     if verbose:
         print(f"[inventory] Starting inventory generation")
         print(f"[inventory] Roots: {roots}")
@@ -113,9 +216,44 @@ def generate_inventory(
         print(f"[inventory] Max files: {max_files}")
         print(f"[inventory] Max seconds: {max_seconds}")
 
-    with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
+    # Rows waiting on their hash, in scan order; bounded so memory stays flat
+    pending: deque = deque()
+    max_pending = max(1, hash_workers) * 16
+
+    # Finished rows, written in blocks of WRITE_BATCH_SIZE
+    batch: List[tuple] = []
+
+    def emit(row: tuple) -> None:
+        batch.append(row)
+        if len(batch) >= WRITE_BATCH_SIZE:
+            writerows(batch)
+            batch.clear()
+
+    def write_ready(drain: bool = False) -> None:
+        while pending and (drain or len(pending) > max_pending or pending[0][1].done()):
+            row, digest = pending.popleft()
+            emit(row + (digest.result(),))
+
+    def keep_dir(parent: str, d: os.DirEntry) -> bool:
+        # Always prune flag archives; the name test is cheap and rarely true
+        if d.name in _FLAG_ARCHIVE_DIRS and parent.endswith(_FLAGS_DIR_SUFFIX):
+            return False
+        # Operator exclusions prune traversal
+        return not (exclude_re and _matches_any_glob(d.path, exclude_re))
+
+    # 1 MiB buffer: the CSV is written in a few large writes, not per row
+    with out_csv.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f, \
+            ThreadPoolExecutor(max_workers=max(1, hash_workers)) as hasher:
+        w = csv.writer(f)
+        w.writerow(fields)
+
+        # Hot-loop callables bound once (saves attribute lookups per file)
+        writerows = w.writerows
+        gmtime = time.gmtime
+        submit = hasher.submit
+        enqueue = pending.append
+        mtime_format = _MTIME_FORMAT
+        monotonic = time.monotonic
 
         for root_s in roots:
             root = Path(root_s)
@@ -125,89 +263,78 @@ def generate_inventory(
             if verbose:
                 print(f"[inventory] Scanning: {root}")
 
-            for dirpath, dirnames, filenames in os.walk(str(root)):
+            root_str = str(root)
+            # relpath is sliced off fullpath instead of Path.relative_to
+            rel_start = len(root_str) if root_str.endswith(os.sep) else len(root_str) + 1
+
+            # Everything under a root inside a flag archive is excluded; below
+            # the root, keep_dir prunes the archives so files need no check
+            if any(m in root_str + os.sep for m in _HARD_EXCLUDE_MARKERS):
+                continue
+
+            for entries in _scan_tree(root_str, keep_dir):
                 # Safety brake: time-based (checked per directory)
-                if max_seconds and (time.monotonic() - started) > max_seconds:
+                if monotonic() > deadline:
                     stopped_reason = f"max_seconds_exceeded({max_seconds})"
                     break
 
-                # Prune excluded directories so we do not traverse them at all
-                pruned: List[str] = []
-                for d in dirnames:
-                    d_full = str(Path(dirpath) / d)
-
-                    # Always prune flag archives (standard HJB convention)
-                    if "\\flags\\completed\\" in d_full or "\\flags\\failed\\" in d_full:
-                        continue
-
-                    # Operator exclusions prune traversal
-                    if exclude_globs and _matches_any_glob(d_full, exclude_globs):
-                        continue
-
-                    pruned.append(d)
-                dirnames[:] = pruned
-
-                for name in filenames:
+                for e in entries:
                     # Safety brake: count-based
                     if max_files and files_seen >= max_files:
                         stopped_reason = f"max_files_reached({max_files})"
                         break
 
-                    full = Path(dirpath) / name
-
-                    # Normalize once for matching
-                    full_str = str(full)
-
-                    # Hard default exclusions (always on)
-                    if "\\flags\\completed\\" in full_str or "\\flags\\failed\\" in full_str:
-                        continue
+                    full_str = e.path
 
                     # Operator-specified exclusions
-                    if exclude_globs and _matches_any_glob(full_str, exclude_globs):
+                    if exclude_re and _matches_any_glob(full_str, exclude_re):
                         continue
 
                     # Operator-specified inclusions
-                    if include_globs and not _matches_any_glob(full_str, include_globs):
+                    if include_re and not _matches_any_glob(full_str, include_re):
                         continue
 
                     try:
-                        st = full.stat()
+                        st = e.stat()
                     except OSError:
                         continue
 
+                    size = st.st_size
                     files_seen += 1
-                    bytes_seen += int(st.st_size)
-                    mtime_utc = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(timespec="seconds")
+                    bytes_seen += size
+                    # Same text as datetime(..., tz=utc).isoformat(timespec="seconds")
+                    t = gmtime(st.st_mtime)
+                    mtime_utc = mtime_format % (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
 
-                    try:
-                        rel = str(full.relative_to(root))
-                    except Exception:
-                        rel = ""
-
-                    row = {
-                        "root": str(root),
-                        "relpath": rel,
-                        "fullpath": str(full),
-                        "size_bytes": int(st.st_size),
-                        "mtime_utc": mtime_utc,
-                    }
+                    # Positional row in `fields` order
+                    row = (root_str, full_str[rel_start:], full_str, size, mtime_utc)
 
                     if include_sha256:
-                        row["sha256"] = _compute_sha256(full)
-
-                    w.writerow(row)
+                        enqueue((row, submit(_compute_sha256, full_str)))
+                        write_ready()
+                    else:
+                        emit(row)
 
                     # Progress reporting
                     if verbose and files_seen % 1000 == 0:
                         elapsed = int(time.monotonic() - started)
                         print(f"[inventory] Progress: {files_seen} files, {bytes_seen:,} bytes, {elapsed}s elapsed")
 
+                    # Safety brake: time-based, sampled every 1024 files so
+                    # very large directories cannot overrun the deadline
+                    if not files_seen & 1023 and monotonic() > deadline:
+                        stopped_reason = f"max_seconds_exceeded({max_seconds})"
+                        break
+
                 if stopped_reason:
                     break
 
             if stopped_reason:
                 break
 
+        write_ready(drain=True)
+        writerows(batch)
+
     elapsed_seconds = int(time.monotonic() - started)
 
     if verbose:
@@ -248,7 +375,8 @@ def execute_from_manifest(
             "include_globs": ["*.pdf", "*.jpg"],
             "exclude_globs": ["*/_tmp/*"],
             "max_files": 100000,
-            "max_seconds": 1800
+            "max_seconds": 1800,
+            "hash_workers": 8
         }
     }
 
@@ -296,6 +424,10 @@ def execute_from_manifest(
     if not isinstance(max_seconds, int) or max_seconds < 0:
         raise ValueError("payload.max_seconds must be an int >= 0 (0 disables the limit)")
 
+    hash_workers = payload.get("hash_workers", DEFAULT_HASH_WORKERS)
+    if not isinstance(hash_workers, int) or hash_workers < 1:
+        raise ValueError("payload.hash_workers must be an int >= 1")
+
     # Output directory: flags_root/completed/task_id/inventory/
     output_dir = flags_root / "completed" / task_id / "inventory"
 
@@ -309,6 +441,7 @@ def execute_from_manifest(
         max_files=max_files,
         max_seconds=max_seconds,
         verbose=True,
+        hash_workers=hash_workers,
     )
 
 
@@ -382,6 +515,12 @@ Examples:
         default=1800,
         help="Stop after this many seconds (0=unlimited, default=1800)",
     )
+    ap.add_argument(
+        "--hash-workers",
+        type=int,
+        default=DEFAULT_HASH_WORKERS,
+        help=f"Threads computing SHA256 hashes (default={DEFAULT_HASH_WORKERS})",
+    )
     ap.add_argument(
         "--verbose",
         action="store_true",
@@ -419,6 +558,7 @@ Examples:
             max_files=args.max_files,
             max_seconds=args.max_seconds,
             verbose=verbose,
+            hash_workers=args.hash_workers,
         )
 
         if not args.quiet:
@@ -30,15 +30,18 @@ log = logging.getLogger(__name__)
 # Module-level constants for efficiency (avoid recreating on each call)
 _ROMAN_VALUES = {'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000}
 
-# Pre-compiled regex patterns for identifier parsing
-_PATTERN_STANDARD_ISSUE = re.compile(
-    r'^(?P<pub>.+?)_(?P<date>\d{4}-\d{2}-\d{2})_(?P<vol>\d+)_(?P<issue>\d+)$'
-)
-_PATTERN_ANNUAL_INDEX = re.compile(
-    r'^(?P<pub>.+?)_(?P<year>\d{4})_(?P<vol>\d+)_index$'
-)
-_PATTERN_HALFYEAR_INDEX = re.compile(
-    r'^(?P<pub>.+?)_(?P<monthrange>[a-z]+-[a-z]+-\d{4})_(?P<vol>\d+)_index$'
+# All three identifier shapes in one pre-compiled pattern (applied after the
+# 'sim_' prefix), so each identifier is scanned once instead of up to three
+# times. The alternatives are mutually exclusive by their endings.
+#   standard issue:    [pub]_[yyyy-mm-dd]_[vol]_[issue]
+#   annual index:      [pub]_[yyyy]_[vol]_index
+#   half-year index:   [pub]_[month-month-yyyy]_[vol]_index
+_PATTERN_IDENTIFIER = re.compile(
+    r'(?P<pub>.+?)_(?:'
+    r'(?P<y>\d{4})-(?P<m>\d{2})-(?P<d>\d{2})_(?P<vol>\d+)_(?P<issue>\d+)'
+    r'|(?P<year>\d{4})_(?P<index_vol>\d+)_index'
+    r'|(?P<months>[a-z]+-[a-z]+)-(?P<half_year>\d{4})_(?P<half_vol>\d+)_index'
+    r')'
 )
 
 
@@ -144,79 +147,50 @@ def parse_american_architect_identifier(ia_identifier: str) -> Optional[ParsedIA
         log.warning(f"Not a SIM identifier: {identifier}")
         return None
     
-    # Remove 'sim_' prefix
-    rest = identifier[4:]
-
-    # Try pre-compiled patterns in order
-    matched = None
-    match_type = None
-
-    # Try standard issue pattern first (most common)
-    m = _PATTERN_STANDARD_ISSUE.match(rest)
-    if m:
-        matched = m
-        match_type = 0
-    else:
-        # Try annual index
-        m = _PATTERN_ANNUAL_INDEX.match(rest)
-        if m:
-            matched = m
-            match_type = 1
-        else:
-            # Try half-year index
-            m = _PATTERN_HALFYEAR_INDEX.match(rest)
-            if m:
-                matched = m
-                match_type = 2
-    
+    # Match everything after the 'sim_' prefix in one pass
+    matched = _PATTERN_IDENTIFIER.fullmatch(identifier, 4)
     if not matched:
         log.warning(f"Could not parse identifier: {identifier}")
         return None
-    
-    groups = matched.groupdict()
-    
-    # Parse based on match type
-    pub = groups['pub'].replace('-', '_')
-    pub_short = pub
-    
+
+    pub, y, m, d, vol, issue, year, index_vol, months, half_year, half_vol = matched.groups()
+
+    # Parse based on which alternative matched
+    pub_short = pub.replace('-', '_')
+
     warnings = []
-    
-    if match_type == 0:  # Standard issue
-        date_str = groups['date']
-        issue_date = datetime.strptime(date_str, "%Y-%m-%d")
+
+    if vol is not None:  # Standard issue
+        issue_date = datetime(int(y), int(m), int(d))
         year = issue_date.year
-        volume_num = int(groups['vol'])
-        issue_num = int(groups['issue'])
+        volume_num = int(vol)
+        issue_num = int(issue)
         is_index = False
         half_year_range = None
-        
-    elif match_type == 1:  # Annual index
-        year = int(groups['year'])
-        volume_num = int(groups['vol'])
+
+    elif index_vol is not None:  # Annual index
+        year = int(year)
+        volume_num = int(index_vol)
         issue_date = None
         issue_num = None
         is_index = True
         half_year_range = None
-        
-    elif match_type == 2:  # Half-year index
-        # Parse "january-june-1927" -> extract year and month range
-        monthrange_str = groups['monthrange']
-        parts = monthrange_str.rsplit('-', 1)  # Split from right to get year
-        month_part = parts[0]  # "january-june"
-        year = int(parts[1])
-        volume_num = int(groups['vol'])
+
+    else:  # Half-year index, e.g. "january-june-1927"
+        year = int(half_year)
+        volume_num = int(half_vol)
         issue_date = None
         issue_num = None
         is_index = True
-        half_year_range = month_part
-    
+        half_year_range = months
+
     # Try to extract roman numeral from publication title (format the volume)
     # This is heuristic - we'd normally get it from IA metadata
     volume_roman = f"V{volume_num}"  # Placeholder (would need IA metadata for actual)
     
     result = ParsedIAIdentifier(
         raw_identifier=identifier,
-        publication=groups['pub'],
+        publication=pub,
         publication_short=pub_short,
         is_index=is_index,
         issue_date=issue_date,
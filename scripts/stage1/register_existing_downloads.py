@@ -15,6 +15,12 @@ Usage:
     # Verbose mode with custom log directory
     python scripts/stage1/register_existing_downloads.py --family American_Architect_family --verbose --log-dir logs
 
+    # More parallel registrations (default: 8)
+    python scripts/stage1/register_existing_downloads.py --family American_Architect_family --workers 16
+
+    # Parse local metadata on the registration threads instead of a process pool
+    python scripts/stage1/register_existing_downloads.py --family American_Architect_family --parse-processes 0
+
 Prerequisites:
     - Database access configured (HJB_MYSQL_PASSWORD environment variable or config.yaml)
     - NAS access to Raw_Input/0110_Internet_Archive/SIM/
@@ -27,10 +33,14 @@ import argparse
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Add repo root to path for imports
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -49,6 +59,11 @@ DEFAULT_BASE_PATH = Path(r"\\RaneyHQ\Michael\02_Projects\Historical_Journals_And
 DEFAULT_RAW_INPUT_IA = DEFAULT_BASE_PATH / "Raw_Input" / "0110_Internet_Archive" / "SIM"
 FAMILY_MAPPING_FILE = REPO_ROOT / "config" / "ia_family_mapping.json"
 
+# Scanned item dirs handed from the scan thread to the DB check, and the max
+# number of identifiers per get_registered_ids() lookup
+SCAN_QUEUE_SIZE = 1000
+CHECK_BATCH_SIZE = 500
+
 
 def setup_logging(log_dir: Path, verbose: bool = False) -> logging.Logger:
     """
@@ -106,69 +121,148 @@ def load_family_mapping() -> Dict[str, Dict]:
         return {}
 
 
-def scan_family_directory(
+def iter_family_directory(
     family_root: str,
     base_path: Path = DEFAULT_RAW_INPUT_IA,
-) -> List[Path]:
+) -> Iterator[Path]:
     """
-    Find all item directories in a family directory.
+    Yield item directories in a family directory, in directory order.
 
     An item directory is identified by containing a _meta.json file or
-    having a name starting with 'sim_'.
+    having a name starting with 'sim_' (and not being empty). An entry that
+    can't be inspected (e.g. removed mid-scan) is reported and skipped.
 
     Args:
         family_root: Family directory name (e.g., "American_Architect_family")
         base_path: Base path to IA downloads
 
-    Returns:
-        List of paths to item directories
+    Yields:
+        Paths to item directories
+
+    Raises:
+        FileNotFoundError: if the family directory itself does not exist
     """
     family_dir = base_path / family_root
 
-    if not family_dir.exists():
-        raise FileNotFoundError(f"Family directory not found: {family_dir}")
+    try:
+        entries = os.scandir(family_dir)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Family directory not found: {family_dir}") from None
+
+    with entries:
+        for entry in entries:
+            # DirEntry caches the d_type from the directory read: no extra stat
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+
+            # Check if it looks like an IA item directory
+            meta_path = os.path.join(entry.path, entry.name + "_meta.json")
+            try:
+                is_item = os.path.exists(meta_path) or (
+                    entry.name.startswith("sim_") and _dir_has_entries(entry.path)
+                )
+            except OSError as e:
+                print(f"  [WARN] Skipping {entry.name}: {e}")
+                continue
+            if is_item:
+                yield Path(entry.path)
 
-    items = []
-    for item_dir in family_dir.iterdir():
-        if not item_dir.is_dir():
-            continue
 
-        # Check if it looks like an IA item directory
-        has_meta = (item_dir / f"{item_dir.name}_meta.json").exists()
-        has_any_file = any(item_dir.iterdir())
-        is_sim = item_dir.name.startswith("sim_")
+def scan_family_directory(
+    family_root: str,
+    base_path: Path = DEFAULT_RAW_INPUT_IA,
+) -> List[Path]:
+    """
+    Find all item directories in a family directory.
 
-        if has_meta or (is_sim and has_any_file):
-            items.append(item_dir)
+    Args:
+        family_root: Family directory name (e.g., "American_Architect_family")
+        base_path: Base path to IA downloads
+
+    Returns:
+        Sorted list of paths to item directories
+    """
+    return sorted(iter_family_directory(family_root, base_path))
 
-    return sorted(items)
 
+_SCAN_DONE = object()
 
-def is_already_registered(
-    identifier: str,
+
+def iter_scan_batches(
+    family_root: str,
+    base_path: Path = DEFAULT_RAW_INPUT_IA,
+    batch_size: int = CHECK_BATCH_SIZE,
+) -> Iterator[List[Path]]:
+    """
+    Scan a family directory on a background thread, yielding batches of items.
+
+    The NAS directory walk and the caller's per-batch work (the MySQL
+    existence check) overlap instead of running back to back. A batch holds
+    whatever has been scanned so far, up to batch_size items; errors from the
+    scan (e.g. FileNotFoundError) are re-raised here.
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+
+    def produce() -> None:
+        try:
+            for item_dir in iter_family_directory(family_root, base_path):
+                q.put(item_dir)
+        except Exception as e:
+            q.put(e)
+        finally:
+            q.put(_SCAN_DONE)
+
+    threading.Thread(target=produce, name="family-scan", daemon=True).start()
+
+    done = False
+    while not done:
+        batch: List[Path] = []
+        item = q.get()  # block until the scan has something
+        while True:
+            if item is _SCAN_DONE:
+                done = True
+                break
+            if isinstance(item, Exception):
+                raise item
+            batch.append(item)
+            if len(batch) >= batch_size:
+                break
+            try:
+                item = q.get_nowait()
+            except queue.Empty:
+                break
+        if batch:
+            yield batch
+
+
+def _dir_has_entries(path: str) -> bool:
+    """Return True if the directory has at least one entry (reads only the first)."""
+    with os.scandir(path) as it:
+        return next(it, None) is not None
+
+
+def get_registered_ids(
+    identifiers: List[str],
     source_system: str = "internet_archive",
-) -> Optional[int]:
+) -> Dict[str, int]:
     """
-    Check if a container is already registered in the database.
+    Check which identifiers are already registered, in one batched lookup.
 
     Args:
-        identifier: The Internet Archive identifier
+        identifiers: Internet Archive identifiers
         source_system: Source system identifier
 
     Returns:
-        container_id if registered, None otherwise
+        Dict mapping registered identifiers to their container_id
     """
     if not DB_AVAILABLE or hjb_db is None:
-        return None
+        return {}
 
     try:
-        existing = hjb_db.get_container_by_source(source_system, identifier)
-        if existing:
-            return existing.get("container_id")
+        return hjb_db.get_container_ids_by_source(source_system, identifiers)
     except Exception as e:
         print(f"  [WARN] Database query failed: {e}")
-
-    return None
+        return {}
 
 
 def register_single_item(
@@ -177,6 +271,8 @@ def register_single_item(
     family: str,
     dry_run: bool = False,
     logger: Optional[logging.Logger] = None,
+    existing_id: Optional[int] = None,
+    local_meta: Optional[Dict[str, Any]] = None,
 ) -> Tuple[str, Optional[int], str]:
     """
     Register a single item in the database.
@@ -187,6 +283,8 @@ def register_single_item(
         family: Publication family name
         dry_run: If True, don't actually register
         logger: Logger instance
+        existing_id: container_id if already registered (see get_registered_ids)
+        local_meta: Pre-parsed reconstruct_metadata_from_local() result, if any
 
     Returns:
         Tuple of (status, container_id, message)
@@ -194,8 +292,6 @@ def register_single_item(
     """
     log = logger or logging.getLogger("register_existing")
 
-    # Check if already registered
-    existing_id = is_already_registered(identifier)
     if existing_id:
         return ("skipped", existing_id, f"Already registered (container_id: {existing_id})")
 
@@ -208,6 +304,7 @@ def register_single_item(
             identifier=identifier,
             download_dir=download_dir,
             family=family,
+            local_meta=local_meta,
         )
 
         if container_id:
@@ -220,6 +317,59 @@ def register_single_item(
         return ("failed", None, f"Error: {type(e).__name__}: {e}")
 
 
+def _register_parsed(
+    identifier: str,
+    download_dir: Path,
+    family: str,
+    logger: logging.Logger,
+    parsed: "Future[Dict[str, Any]]",
+) -> Tuple[str, Optional[int], str]:
+    """Wait for an item's metadata from the parse pool, then register it."""
+    try:
+        local_meta = parsed.result()
+    except (FileNotFoundError, ValueError) as e:
+        return ("failed", None, f"Failed to reconstruct metadata: {e}")
+    except Exception as e:
+        logger.exception(f"Failed to parse {identifier}")
+        return ("failed", None, f"Error: {type(e).__name__}: {e}")
+
+    return register_single_item(
+        identifier=identifier,
+        download_dir=download_dir,
+        family=family,
+        logger=logger,
+        local_meta=local_meta,
+    )
+
+
+def _report_item(
+    identifier: str,
+    status: str,
+    container_id: Optional[int],
+    message: str,
+    stats: Dict[str, int],
+    logger: logging.Logger,
+) -> None:
+    """Tally one item's result and print/log it with a status indicator."""
+    stats[status] = stats.get(status, 0) + 1
+
+    print(f"Processing: {identifier}")
+
+    # Console output with status indicator
+    if status == "registered":
+        print(f"  \u2713 {message}")
+        logger.info(f"  REGISTERED: {identifier} -> {container_id}")
+    elif status == "skipped":
+        print(f"  \u2298 {message}")
+        logger.debug(f"  SKIPPED: {identifier} (already registered)")
+    elif status == "dry_run":
+        print(f"  \u2022 {message}")
+        logger.debug(f"  DRY_RUN: {identifier}")
+    else:  # failed
+        print(f"  \u2717 {message}")
+        logger.error(f"  FAILED: {identifier} - {message}")
+
+
 def main() -> int:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -261,6 +411,19 @@ Examples:
         default=DEFAULT_RAW_INPUT_IA,
         help=f"Base path to IA downloads (default: {DEFAULT_RAW_INPUT_IA})",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Parallel registration workers; each item is NAS + MySQL bound (default: 8)",
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes for the CPU-bound metadata parsing (identifier, scandata.xml, "
+             "_meta.json); 0 parses on the registration threads (default: CPU count)",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -294,57 +457,81 @@ Examples:
     print(f"Dry run: {args.dry_run}")
     print(f"{'='*60}\n")
 
-    try:
-        items = scan_family_directory(args.family, args.base_path)
-    except FileNotFoundError as e:
-        logger.error(str(e))
-        return 1
-
-    if not items:
-        logger.warning(f"No items found in {args.family}")
-        return 0
-
-    print(f"Found {len(items)} items\n")
-    logger.info(f"Found {len(items)} items in {args.family}")
-
-    # Process each item
     stats = {
-        "total": len(items),
+        "total": 0,
         "registered": 0,
         "skipped": 0,
         "failed": 0,
         "dry_run": 0,
     }
 
-    for item_dir in items:
-        identifier = item_dir.name
-
-        print(f"Processing: {identifier}")
-        logger.debug(f"Processing: {identifier} at {item_dir}")
-
-        status, container_id, message = register_single_item(
-            identifier=identifier,
-            download_dir=item_dir,
-            family=args.family,
-            dry_run=args.dry_run,
-            logger=logger,
-        )
-
-        stats[status] = stats.get(status, 0) + 1
-
-        # Console output with status indicator
-        if status == "registered":
-            print(f"  \u2713 {message}")
-            logger.info(f"  REGISTERED: {identifier} -> {container_id}")
-        elif status == "skipped":
-            print(f"  \u2298 {message}")
-            logger.debug(f"  SKIPPED: {identifier} (already registered)")
-        elif status == "dry_run":
-            print(f"  \u2022 {message}")
-            logger.debug(f"  DRY_RUN: {identifier}")
-        else:  # failed
-            print(f"  \u2717 {message}")
-            logger.error(f"  FAILED: {identifier} - {message}")
+    # The scan runs on its own thread; each batch it produces gets one
+    # registered-ids lookup and is queued for registration straight away.
+    # Items are independent and I/O-bound (NAS reads + MySQL round-trips), so
+    # they register on a thread pool; hjb_db hands each query a connection
+    # from its pool (shared between the threads) rather than a new one.
+    # Parsing the local metadata of new items is CPU-bound and would hold the
+    # GIL against those threads, so it runs on a process pool; each thread
+    # then only waits for its item's parse result before the DB writes.
+    hjb_db.use_connection_pool()
+    use_parse_pool = args.parse_processes > 0 and not args.dry_run
+    parse_pool = ProcessPoolExecutor(max_workers=args.parse_processes) if use_parse_pool else nullcontext()
+    scan_failed = False
+    with parse_pool as px, ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        futures = {}
+        try:
+            for batch in iter_scan_batches(args.family, args.base_path):
+                registered = get_registered_ids([item_dir.name for item_dir in batch])
+                for item_dir in batch:
+                    logger.debug(f"Processing: {item_dir.name} at {item_dir}")
+                    existing_id = registered.get(item_dir.name)
+                    if px is not None and not existing_id:
+                        parsed = px.submit(reconstruct_metadata_from_local, item_dir.name, item_dir)
+                        fut = ex.submit(
+                            _register_parsed, item_dir.name, item_dir, args.family, logger, parsed,
+                        )
+                        futures[fut] = item_dir.name
+                        continue
+                    fut = ex.submit(
+                        register_single_item,
+                        identifier=item_dir.name,
+                        download_dir=item_dir,
+                        family=args.family,
+                        dry_run=args.dry_run,
+                        logger=logger,
+                        existing_id=existing_id,
+                    )
+                    futures[fut] = item_dir.name
+        except OSError as e:
+            # FileNotFoundError here is the family directory itself missing
+            # (per-entry errors are skipped by the scan)
+            if isinstance(e, FileNotFoundError):
+                logger.error(str(e))
+            else:
+                logger.error(f"Scan of {args.family} failed: {e}")
+            scan_failed = True
+            # Items not started yet are dropped; those already running are
+            # reported below so the log matches what reached the database
+            for fut in futures:
+                fut.cancel()
+
+        if not futures:
+            if scan_failed:
+                return 1
+            logger.warning(f"No items found in {args.family}")
+            return 0
+
+        if not scan_failed:
+            print(f"Found {len(futures)} items\n")
+            logger.info(f"Found {len(futures)} items in {args.family}")
+
+        for fut in as_completed(futures):
+            if fut.cancelled():
+                continue
+            identifier = futures[fut]
+            status, container_id, message = fut.result()
+            stats["total"] += 1
+            _report_item(identifier, status, container_id, message, stats, logger)
 
     # Summary
     print(f"\n{'='*60}")
@@ -361,6 +548,9 @@ Examples:
     logger.info(f"Summary: total={stats['total']}, registered={stats['registered']}, "
                 f"skipped={stats['skipped']}, failed={stats['failed']}")
 
+    if scan_failed:
+        logger.error("Scan aborted: items after the failure were not registered")
+        return 1
     return 0 if stats["failed"] == 0 else 1
 
 
@@ -637,4 +637,6 @@ def main() -> int:
         release_single_instance_lock(lock_dir)
 
 if __name__ == "__main__":
+    # UTF-8 console output (task identifiers and paths may be non-ASCII)
+    sys.stdout.reconfigure(encoding="utf-8")
     raise SystemExit(main())
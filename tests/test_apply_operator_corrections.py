@@ -0,0 +1,99 @@
+"""mark_spreads_bulk matches marking the pairs one at a time."""
+
+import importlib
+import re
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+
+@pytest.fixture
+def corrections(tmp_path, monkeypatch):
+    # The module opens corrections.log in the working directory on import
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("scripts.qa.apply_operator_corrections")
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self, **kwargs):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class RecordingCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        self.conn.executed.append((query, list(params)))
+
+
+def apply_update(query, params):
+    """Evaluate the UPDATE's CASE the way MySQL does: the first matching WHEN wins."""
+    n_when = len(re.findall(r"WHEN %s THEN %s", query))
+    whens = [(params[2 * i], params[2 * i + 1]) for i in range(n_when)]
+    targets = params[2 * n_when:]
+    result = {}
+    for page_id in targets:
+        result[page_id] = next(partner for when, partner in whens if when == page_id)
+    return result
+
+
+def one_at_a_time(pairs):
+    """The loop mark_spreads_bulk replaced: one mark_spread per pair."""
+    partners = {}
+    for page_id_1, page_id_2 in pairs:
+        partners[page_id_1] = page_id_2
+        partners[page_id_2] = page_id_1
+    return partners
+
+
+@pytest.mark.parametrize(
+    "pairs",
+    [
+        [(10, 11), (12, 13)],
+        [(10, 11), (11, 12)],
+        [(10, 11), (10, 12), (13, 10)],
+        [(10, 11), (10, 11)],
+        [(5, 5)],
+    ],
+)
+def test_repeated_pages_keep_the_last_partner(corrections, pairs):
+    conn = RecordingConnection()
+    result = corrections.mark_spreads_bulk(conn, pairs)
+    assert result["error"] is None
+    assert conn.commits == 1
+    [(query, params)] = conn.executed
+    assert apply_update(query, params) == one_at_a_time(pairs)
+
+
+def test_each_page_is_updated_once(corrections):
+    conn = RecordingConnection()
+    corrections.mark_spreads_bulk(conn, [(1, 2), (2, 3), (3, 1)])
+    [(query, params)] = conn.executed
+    targets = params[2 * len(re.findall(r"WHEN %s THEN %s", query)):]
+    assert sorted(targets) == [1, 2, 3]
+
+
+def test_dry_run_executes_nothing(corrections):
+    conn = RecordingConnection()
+    result = corrections.mark_spreads_bulk(conn, [(1, 2), (2, 3)], dry_run=True)
+    assert conn.executed == []
+    assert result["rows_affected"] == 3
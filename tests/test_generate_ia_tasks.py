@@ -0,0 +1,44 @@
+"""Batch task-flag templates render byte-identically to direct serialization."""
+
+import pytest
+
+from scripts.stage1 import generate_ia_tasks as tasks
+
+IDENTIFIERS = [
+    "sim_american-architect-and-architecture_1876-01-01_1_1",
+    'sim_quote"in_id',
+    "sim_back\\slash_id",
+    "sim_percent%d%s%%_id",
+    "sim_café_建筑_\U0001f3db_id",
+    "sim_tab\tand\nnewline",
+    tasks._IDENT_PLACEHOLDER,
+    tasks._NUMBER_PLACEHOLDER,
+    f"sim_{tasks._IDENT_PLACEHOLDER}_{tasks._NUMBER_PLACEHOLDER}",
+    "%(ia_identifier)s%(task_number)d",
+]
+
+STAMP = "20240101T000000Z"
+CREATED_AT = "2024-01-01T00:00:00+00:00"
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "json":
+        monkeypatch.setattr(tasks, "orjson", None)
+    elif tasks.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("family", ["American_Architect_family", "Family 100% über"])
+def test_render_matches_direct_serialization(serializer, family):
+    total = len(IDENTIFIERS)
+    template = tasks.build_task_flag_template(family, total, STAMP, CREATED_AT)
+    for number, identifier in enumerate(IDENTIFIERS, 1):
+        expected = tasks.dumps_task_flag(
+            tasks.generate_task_flag(
+                identifier, family, number, total, stamp=STAMP, created_at=CREATED_AT
+            )
+        )
+        assert tasks.render_task_flag(template, identifier, number) == expected
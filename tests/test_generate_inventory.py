@@ -0,0 +1,104 @@
+"""generate_inventory: the scandir walk matches the os.walk traversal it replaced; hashing is robust."""
+
+import csv
+import hashlib
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from scripts.stage1 import generate_inventory as inventory_module
+from scripts.stage1.generate_inventory import generate_inventory
+
+
+def make_tree(root):
+    files = [
+        "a.txt",
+        "sub/b.txt",
+        "sub/deeper/c.txt",
+        "z/d.txt",
+        "flags/pending/task.json",
+        "flags/completed/done.json",
+        "flags/failed/bad.json",
+        "flags/completed/nested/old.json",
+        "other/completed/kept.json",  # only flags/{completed,failed} are pruned
+    ]
+    for i, rel in enumerate(files):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x" * i, encoding="utf-8")
+        os.utime(path, (1_700_000_000 + i * 3601.75, 1_700_000_000 + i * 3601.75))
+    return files
+
+
+def reference_walk(root):
+    """The files os.walk visits (in its order), with flag archives pruned."""
+    rows = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if os.path.basename(dirpath) == "flags":
+            dirnames[:] = [d for d in dirnames if d not in ("completed", "failed")]
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            st = os.stat(full)
+            mtime = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(timespec="seconds")
+            rows.append((os.path.relpath(full, root), str(st.st_size), mtime))
+    return rows
+
+
+def read_inventory(outputs):
+    with open(outputs[0], newline="", encoding="utf-8") as f:
+        return [(r["relpath"], r["size_bytes"], r["mtime_utc"]) for r in csv.DictReader(f)]
+
+
+def test_walk_order_pruning_and_mtime(tmp_path):
+    root = tmp_path / "root"
+    make_tree(root)
+    outputs, metrics = generate_inventory([str(root)], tmp_path / "out", "t1")
+    rows = read_inventory(outputs)
+
+    assert rows == reference_walk(str(root))
+    relpaths = {r[0] for r in rows}
+    assert os.path.join("flags", "pending", "task.json") in relpaths
+    assert os.path.join("other", "completed", "kept.json") in relpaths
+    assert not any(p.startswith(os.path.join("flags", "completed")) for p in relpaths)
+    assert not any(p.startswith(os.path.join("flags", "failed")) for p in relpaths)
+    assert metrics["files_seen"] == len(rows)
+
+
+def test_root_inside_flag_archive_is_skipped(tmp_path):
+    root = tmp_path / "flags" / "completed"
+    root.mkdir(parents=True)
+    (root / "done.json").write_text("{}", encoding="utf-8")
+    outputs, _ = generate_inventory([str(root)], tmp_path / "out", "t2")
+    assert read_inventory(outputs) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_symlinked_directories_are_not_followed(tmp_path):
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "inside.txt").write_text("x", encoding="utf-8")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "real.txt").write_text("y", encoding="utf-8")
+    try:
+        os.symlink(target, root / "linked_dir", target_is_directory=True)
+        os.symlink(root / "real.txt", root / "linked_file.txt")
+    except OSError:
+        pytest.skip("symlinks not permitted")
+
+    outputs, _ = generate_inventory([str(root)], tmp_path / "out", "t3")
+    rows = read_inventory(outputs)
+    assert rows == reference_walk(str(root))
+    assert sorted(r[0] for r in rows) == ["linked_file.txt", "real.txt"]
+
+
+def test_hash_survives_a_refused_fadvise(tmp_path, monkeypatch):
+    # Some NAS/SMB mounts reject posix_fadvise; the hint is optional
+    def refuse(*args):
+        raise OSError(95, "Operation not supported")
+
+    monkeypatch.setattr(inventory_module, "_fadvise", refuse)
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"hjb" * 1000)
+    assert inventory_module._compute_sha256(str(path)) == hashlib.sha256(b"hjb" * 1000).hexdigest()
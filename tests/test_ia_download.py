@@ -0,0 +1,99 @@
+"""download_ia_file: .part handling against a fake archive.org session."""
+
+import hashlib
+
+import pytest
+
+pytest.importorskip("requests")
+
+from scripts.stage1.ia_acquire import download_ia_file
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"unexpected status {self.status_code}")
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class FakeSession:
+    """Serves one body for every URL, honouring "Range: bytes=N-"."""
+
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None, stream=False, timeout=None):
+        self.requests.append((url, headers))
+        if headers and "Range" in headers:
+            offset = int(headers["Range"][len("bytes="):-1])
+            if offset >= len(self.body):
+                return FakeResponse(416, b"")
+            return FakeResponse(206, self.body[offset:])
+        return FakeResponse(200, self.body)
+
+
+def test_zero_length_file(tmp_path):
+    session = FakeSession(b"")
+    dest = download_ia_file(session, "item", "item_djvu.txt", tmp_path, size=0)
+    assert dest == tmp_path / "item_djvu.txt"
+    assert dest.read_bytes() == b""
+    assert not (tmp_path / "item_djvu.txt.part").exists()
+
+
+def test_zero_length_file_without_size(tmp_path):
+    dest = download_ia_file(FakeSession(b""), "item", "item_djvu.txt", tmp_path)
+    assert dest.read_bytes() == b""
+
+
+def test_partial_is_resumed(tmp_path):
+    body = b"0123456789" * 100
+    (tmp_path / "item.pdf.part").write_bytes(body[:300])
+    session = FakeSession(body)
+    dest = download_ia_file(session, "item", "item.pdf", tmp_path, size=len(body))
+    assert dest.read_bytes() == body
+    assert session.requests[0][1] == {"Range": "bytes=300-"}
+
+
+def test_stale_partial_is_discarded(tmp_path):
+    # Left over from an older version of the file: resuming it would append
+    # new bytes to stale ones
+    body = b"new contents " * 50
+    (tmp_path / "item.pdf.part").write_bytes(b"OLD" * 20)
+    session = FakeSession(body)
+    dest = download_ia_file(
+        session, "item", "item.pdf", tmp_path, size=len(body), md5=hashlib.md5(body).hexdigest(),
+    )
+    assert dest.read_bytes() == body
+    assert session.requests[-1][1] is None
+
+
+def test_complete_partial_with_wrong_md5_is_refetched(tmp_path):
+    body = b"x" * 100
+    (tmp_path / "item.pdf.part").write_bytes(b"y" * 100)
+    session = FakeSession(body)
+    dest = download_ia_file(
+        session, "item", "item.pdf", tmp_path, size=len(body), md5=hashlib.md5(body).hexdigest(),
+    )
+    assert dest.read_bytes() == body
+
+
+def test_mismatch_after_a_fresh_download_raises(tmp_path):
+    session = FakeSession(b"served bytes")
+    with pytest.raises(RuntimeError):
+        download_ia_file(session, "item", "item.pdf", tmp_path, md5=hashlib.md5(b"other").hexdigest())
+    assert not (tmp_path / "item.pdf").exists()
+    assert not (tmp_path / "item.pdf.part").exists()
@@ -0,0 +1,64 @@
+"""choose_files_for_item keeps the original selection semantics."""
+
+import random
+
+import pytest
+
+from scripts.stage1.ia_acquire import TIER_COMPREHENSIVE_SUFFIXES, choose_files_for_item
+
+
+def reference_choose(file_names, suffixes):
+    """The original O(files x suffixes) selection loop: (selected, matched suffixes)."""
+    suffix_to_file = {}
+    for name in file_names:
+        if not name:
+            continue
+        for suf in suffixes:
+            if name.endswith(suf) and suf not in suffix_to_file:
+                suffix_to_file[suf] = name
+                break
+    return [suffix_to_file[suf] for suf in suffixes if suf in suffix_to_file], set(suffix_to_file)
+
+
+@pytest.mark.parametrize(
+    "names, suffixes, expected",
+    [
+        # Each name goes to the first listed suffix it ends with that is still
+        # free, so an earlier, shorter suffix can claim the longer match
+        (["x_text.pdf", "x.pdf"], [".pdf", "_text.pdf"], ["x_text.pdf"]),
+        (["x_text.pdf", "x.pdf"], ["_text.pdf", ".pdf"], ["x_text.pdf", "x.pdf"]),
+        (["x.pdf", "x_text.pdf"], [".pdf", "_text.pdf"], ["x.pdf", "x_text.pdf"]),
+        (["x_text.pdf"], [".pdf", "_text.pdf"], ["x_text.pdf"]),
+        # First matching file wins; results come back in suffix order
+        (["b.pdf", "a_jp2.zip", "a.pdf"], ["_jp2.zip", ".pdf"], ["a_jp2.zip", "b.pdf"]),
+        # Empty names are ignored; unmatched suffixes are simply absent
+        (["", "a_meta.xml"], ["_meta.xml", "_djvu.txt"], ["a_meta.xml"]),
+        # A suffix without an extension can match any name
+        (["azip", "b.zip"], ["zip", ".zip"], ["azip", "b.zip"]),
+        ([], [".pdf"], []),
+    ],
+)
+def test_selection_cases(names, suffixes, expected):
+    selected, matched = choose_files_for_item(names, suffixes)
+    assert selected == expected
+    assert (selected, set(matched)) == reference_choose(names, suffixes)
+
+
+def test_matched_suffixes():
+    selected, matched = choose_files_for_item(["a.pdf", "a_meta.xml"], TIER_COMPREHENSIVE_SUFFIXES)
+    assert selected == ["a.pdf", "a_meta.xml"]
+    assert set(matched) == {".pdf", "_meta.xml"}
+
+
+def test_randomized_against_reference():
+    rng = random.Random(1234)
+    name_pool = [
+        "a.pdf", "a_text.pdf", "b_jp2.zip", "c_djvu.txt", "d_djvu.xml", "e.pdf", "x.txt",
+        "", "f_meta.xml", "g.xml", "h_hocr.html", "zip", "_scandata.xml", "noext",
+    ]
+    suffix_pool = TIER_COMPREHENSIVE_SUFFIXES + [".xml", ".txt", "zip", "_text.pdf", ".pdf"]
+    for _ in range(5000):
+        names = rng.sample(name_pool, rng.randint(0, len(name_pool)))
+        suffixes = rng.sample(suffix_pool, rng.randint(0, 6))
+        selected, matched = choose_files_for_item(names, suffixes)
+        assert (selected, set(matched)) == reference_choose(names, suffixes)
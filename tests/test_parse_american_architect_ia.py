@@ -0,0 +1,108 @@
+"""The combined identifier pattern accepts and rejects the same shapes as before."""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from scripts.stage1.parse_american_architect_ia import parse_american_architect_identifier
+
+PUB = "american-architect-and-architecture"
+
+# The three patterns the combined _PATTERN_IDENTIFIER replaced, tried in order
+_OLD_PATTERNS = [
+    re.compile(r'^(?P<pub>.+?)_(?P<date>\d{4}-\d{2}-\d{2})_(?P<vol>\d+)_(?P<issue>\d+)$'),
+    re.compile(r'^(?P<pub>.+?)_(?P<year>\d{4})_(?P<vol>\d+)_index$'),
+    re.compile(r'^(?P<pub>.+?)_(?P<monthrange>[a-z]+-[a-z]+-\d{4})_(?P<vol>\d+)_index$'),
+]
+
+
+def old_shape(identifier):
+    """(pattern number, pub, vol) under the old patterns, or None."""
+    if not identifier.startswith("sim_"):
+        return None
+    for n, pattern in enumerate(_OLD_PATTERNS):
+        m = pattern.match(identifier[4:])
+        if m:
+            return n, m.group("pub"), int(m.group("vol"))
+    return None
+
+
+def test_standard_issue():
+    p = parse_american_architect_identifier(f"sim_{PUB}_1876-01-08_1_2")
+    assert (p.publication, p.publication_short) == (PUB, "american_architect_and_architecture")
+    assert not p.is_index
+    assert p.issue_date == datetime(1876, 1, 8)
+    assert (p.year, p.volume_num, p.issue_num, p.half_year_range) == (1876, 1, 2, None)
+    assert p.canonical_issue_key("AMER_ARCH") == "AMER_ARCH_ISSUE_18760108_001_0002"
+
+
+def test_annual_index():
+    p = parse_american_architect_identifier(f"sim_{PUB}_1876_1_index")
+    assert p.is_index and p.issue_date is None and p.issue_num is None
+    assert (p.year, p.volume_num, p.half_year_range) == (1876, 1, None)
+    assert p.issue_label == "Index 1876"
+
+
+def test_half_year_index():
+    p = parse_american_architect_identifier(f"sim_{PUB}_january-june-1927_131_index")
+    assert p.is_index and p.issue_date is None
+    assert (p.year, p.volume_num, p.half_year_range) == (1927, 131, "january-june")
+    assert p.issue_label == "Index January June 1927"
+
+
+def test_publication_with_underscores_is_matched_lazily():
+    p = parse_american_architect_identifier("sim_some_pub_name_1900-02-03_12_7")
+    assert p.publication == "some_pub_name"
+    assert (p.volume_num, p.issue_num) == (12, 7)
+
+
+def test_surrounding_whitespace_is_ignored():
+    p = parse_american_architect_identifier(f"  sim_{PUB}_1876_1_index\n")
+    assert p.raw_identifier == f"sim_{PUB}_1876_1_index"
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    [
+        f"{PUB}_1876-01-08_1_2",                 # no sim_ prefix
+        f"sim_{PUB}_1876-01-08_1",               # issue number missing
+        f"sim_{PUB}_1876-1-8_1_2",               # date not zero-padded
+        f"sim_{PUB}_1876-01-08_1_2_extra",       # trailing text
+        f"sim_{PUB}_1876_1_index_extra",
+        f"sim_{PUB}_76_1_index",                 # two-digit year
+        f"sim_{PUB}_1876_v1_index",              # non-numeric volume
+        f"sim_{PUB}_January-June-1927_131_index",  # month names are lowercase
+        f"sim_{PUB}_january-1927_131_index",     # single month
+        f"sim_{PUB}_1876_1_supplement",
+        "sim_",
+        "sim__1876_1_index",                     # empty publication
+        "",
+    ],
+)
+def test_rejected_shapes(identifier):
+    assert parse_american_architect_identifier(identifier) is None
+
+
+@pytest.mark.parametrize(
+    "identifier",
+    [
+        f"sim_{PUB}_1876-01-08_1_2",
+        f"sim_{PUB}_1876_1_index",
+        f"sim_{PUB}_january-june-1927_131_index",
+        f"sim_{PUB}_july-december-1927_132_index",
+        "sim_a_b_1876_1_index",
+        "sim_x_1876-01-01_1_1_1876_2_index",
+        "sim_x_2000_3_1876-01-01_1_1",
+        "sim_x-y_march-april-2001_9_index",
+        "sim_x_1876_1_index_1876-01-01_1_1",
+    ],
+)
+def test_agrees_with_the_separate_patterns(identifier):
+    expected = old_shape(identifier)
+    parsed = parse_american_architect_identifier(identifier)
+    assert expected is not None and parsed is not None
+    kind, pub, vol = expected
+    assert (parsed.publication, parsed.volume_num) == (pub, vol)
+    assert parsed.is_index == (kind != 0)
+    assert (parsed.half_year_range is not None) == (kind == 2)